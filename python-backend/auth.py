@@ -3,9 +3,11 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Request
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import User
 from schemas import TokenData
 from config import settings
@@ -43,9 +45,9 @@ def verify_token(token: str, credentials_exception):
     except JWTError:
         raise credentials_exception
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,20 +58,32 @@ def get_current_user(
     token = credentials.credentials
     token_data = verify_token(token, credentials_exception)
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    result = await db.execute(select(User).where(User.email == token_data.email))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
     return user
 
+async def get_current_admin(current_user: User = Depends(get_current_user)):
+    """The current user, if their email is listed in ADMIN_EMAILS"""
+    admins = {email.strip().lower() for email in settings.admin_emails.split(",") if email.strip()}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
 # Add cookie-based authentication for frontend compatibility
-def get_current_user_from_cookie(
+async def get_current_user_from_cookie(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user from cookie - frontend compatibility"""
     # For now, return a mock user for testing
     # In production, you would implement proper cookie-based auth
-    user = db.query(User).first()
+    result = await db.execute(select(User).limit(1))
+    user = result.scalars().first()
     if not user:
         # Create a test user if none exists
         user = User(
@@ -78,13 +92,31 @@ def get_current_user_from_cookie(
             provider="google"
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     return user
 
-def get_or_create_user(email: str, name: str, picture: str = None, provider: str = "google", db: Session = None):
+async def get_interview_owner(
+    connection: HTTPConnection,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """The user that owner-scoped interview routes read and write as
+
+    The bearer user when the request carries a token, else the cookie user.
+    Every owner-scoped route resolves its user here, so an interview created
+    through one route is visible to the others for the same caller. While the
+    cookie auth is a mock, all cookie-only callers share the first user.
+    """
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        credentials = HTTPAuthorizationCredentials(scheme=scheme, credentials=token)
+        return await get_current_user(credentials, db)
+    return await get_current_user_from_cookie(connection, db)
+
+async def get_or_create_user(email: str, name: str, picture: str = None, provider: str = "google", db: AsyncSession = None):
     """Get existing user or create new one"""
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     if not user:
         user = User(
             email=email,
@@ -93,6 +125,6 @@ def get_or_create_user(email: str, name: str, picture: str = None, provider: str
             provider=provider
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     return user
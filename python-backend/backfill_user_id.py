@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Backfill interview.user_id from interview.created_by in small batches
+
+Each batch matches created_by against users.email and commits on its own,
+so the script can be stopped at any time and re-run: it resumes after the
+last processed id (kept in a checkpoint file) and only touches rows whose
+user_id is still NULL.
+
+Usage:
+    python backfill_user_id.py [--batch-size 1000] [--default-user-id N] [--sleep 0.1]
+"""
+
+import argparse
+import os
+import time
+
+from sqlalchemy import text
+
+from database import SessionLocal, engine
+
+CHECKPOINT_FILE = ".backfill_user_id.checkpoint"
+
+
+def read_checkpoint(path):
+    if os.path.exists(path):
+        with open(path) as fh:
+            return int(fh.read().strip() or 0)
+    return 0
+
+
+def write_checkpoint(path, last_id):
+    with open(path, "w") as fh:
+        fh.write(str(last_id))
+
+
+def backfill(batch_size, default_user_id=None, sleep=0.0, checkpoint=CHECKPOINT_FILE):
+    last_id = read_checkpoint(checkpoint)
+    if last_id:
+        print(f"Resuming after interview id {last_id}")
+
+    db = SessionLocal()
+    updated = unmatched = 0
+    try:
+        while True:
+            ids = db.execute(
+                text(
+                    "SELECT id FROM interview WHERE id > :last_id AND user_id IS NULL "
+                    "ORDER BY id LIMIT :batch_size"
+                ),
+                {"last_id": last_id, "batch_size": batch_size},
+            ).scalars().all()
+            if not ids:
+                break
+            low, high = ids[0], ids[-1]
+
+            result = db.execute(
+                text(
+                    "UPDATE interview SET updated_at = CURRENT_TIMESTAMP, version = version + 1, user_id = "
+                    "(SELECT users.id FROM users WHERE users.email = interview.created_by) "
+                    "WHERE id BETWEEN :low AND :high AND user_id IS NULL "
+                    "AND created_by IN (SELECT email FROM users)"
+                ),
+                {"low": low, "high": high},
+            )
+            updated += result.rowcount
+
+            if default_user_id is not None:
+                result = db.execute(
+                    text(
+                        "UPDATE interview SET user_id = :user_id, updated_at = CURRENT_TIMESTAMP, version = version + 1 "
+                        "WHERE id BETWEEN :low AND :high AND user_id IS NULL"
+                    ),
+                    {"user_id": default_user_id, "low": low, "high": high},
+                )
+                updated += result.rowcount
+            else:
+                unmatched += db.execute(
+                    text("SELECT COUNT(*) FROM interview WHERE id BETWEEN :low AND :high AND user_id IS NULL"),
+                    {"low": low, "high": high},
+                ).scalar()
+
+            db.commit()
+            last_id = high
+            write_checkpoint(checkpoint, last_id)
+            print(f"  processed ids up to {last_id}: {updated} assigned, {unmatched} without a matching user")
+            if sleep:
+                time.sleep(sleep)
+    finally:
+        db.close()
+
+    if engine.dialect.name == "postgresql":
+        # The foreign key is added NOT VALID by migrate_database.py; NULL owners do not violate it
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE interview VALIDATE CONSTRAINT interview_user_id_fkey"))
+            print("✅ Validated interview_user_id_fkey")
+        except Exception as e:
+            print(f"❌ Could not validate interview_user_id_fkey: {e}")
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"✅ Backfill complete: {updated} interviews assigned, {unmatched} left without an owner")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--default-user-id", type=int, default=None,
+                        help="Owner for interviews whose created_by matches no user")
+    parser.add_argument("--sleep", type=float, default=0.0, help="Pause between batches (seconds)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    args = parser.parse_args()
+    backfill(args.batch_size, args.default_user_id, args.sleep, args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
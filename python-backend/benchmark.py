@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the Voicruit backend
+
+Usage:
+    python benchmark.py listing [--rows 20000] [--page-size 50]
+    python benchmark.py concurrency --url http://localhost:8080/api/interviews/my [--concurrency 50]
+    python benchmark.py llm [--base-url http://localhost:8099/v1] [--concurrency 20] [--delay 0.5]
+    python benchmark.py providers [--slow-rate 0.04] [--slow-delay 3] [--timeout 5]
+    python benchmark.py question-bank [--entries 20000] [--queries 2000]
+    python benchmark.py scoring [--turns 500] [--words 60] [--density 0.05]
+
+Benchmarks run against a throwaway SQLite database unless --database-url is given.
+The llm and providers benchmarks start mock_llm_server.py in-process (llm: unless --base-url is given).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def _setup_database(database_url):
+    """Point the app at the benchmark database before any app module is imported"""
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+        database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = database_url
+    return database_url
+
+
+def bench_listing(args):
+    """Full vs summary listing: bytes per row and latency per page"""
+    _setup_database(args.database_url)
+    from datetime import datetime, timedelta
+    from database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+    from models import Interview
+    from pagination import apply_filters, paginate
+    from routers.interviews import _listing_items, _listing_query
+    from schemas import Interview as InterviewSchema
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    if db.query(Interview).count() < args.rows:
+        questions = json.dumps({"question": [
+            {"question": f"Sample interview question number {n} " + "x" * 200, "type": "technical"}
+            for n in range(10)
+        ]})
+        feedback = json.dumps({"feedback": "y" * 2000, "overallScore": 7.5, "recommendation": "Yes"})
+        start = datetime(2024, 1, 1)
+        db.bulk_insert_mappings(Interview, [
+            {
+                "id": n + 1,
+                "job_title": f"Role {n % 50}",
+                "interview_type": "Technical",
+                "duration": "15 Min",
+                "created_by": "bench@example.com",
+                "user_name": "Candidate",
+                "questions": questions,
+                "feedback": feedback,
+                "created_at": start + timedelta(seconds=n),
+            }
+            for n in range(args.rows)
+        ])
+        db.commit()
+
+    db.close()
+
+    async def run(fields):
+        async with AsyncSessionLocal() as session:
+            query = apply_filters(_listing_query(fields))
+            rows, _ = await paginate(session, query, args.page_size)
+            items = _listing_items(rows, fields)
+            model = InterviewSchema if fields == "full" else type(items[0])
+            return [model.model_validate(item).model_dump_json() for item in items]
+
+    async def measure():
+        print(f"Listing benchmark: {args.rows} rows, page size {args.page_size}")
+        for fields in ("full", "summary"):
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                payloads = await run(fields)
+                samples.append((time.perf_counter() - start) * 1000)
+            bytes_per_row = sum(len(p) for p in payloads) / len(payloads)
+            print(f"  fields={fields:<8} {bytes_per_row:9.0f} bytes/row  {statistics.median(samples):8.2f} ms/page (median)")
+        await async_engine.dispose()
+
+    asyncio.run(measure())
+
+
+def bench_concurrency(args):
+    """Requests/second of a running server under parallel load"""
+    import httpx
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(args.requests))
+
+    async def worker(client):
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(args.url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    async def measure():
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+            await client.get(args.url)  # warm up
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(measure())
+    latencies.sort()
+    print(f"Concurrency benchmark: {args.requests} requests, {args.concurrency} in flight -> {args.url}")
+    print(f"  {args.requests / elapsed:8.1f} req/s")
+    print(f"  p50 {latencies[len(latencies) // 2]:8.2f} ms   p95 {latencies[int(len(latencies) * 0.95)]:8.2f} ms   errors {errors}")
+
+
+def _start_mock_llm(delay, chunk_delay=0.0, **options):
+    """Serve mock_llm_server.py on a free local port from a background thread"""
+    import socket
+    import threading
+    import uvicorn
+    import mock_llm_server
+
+    app = mock_llm_server.create_app(delay, chunk_delay, **options)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1", server
+
+
+def bench_llm(args):
+    """Concurrent question generation: per-request sync client vs the shared async client"""
+    import openai
+    from llm import LLMClient
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        base_url, server = _start_mock_llm(args.delay)
+
+    messages = [{"role": "user", "content": "Generate 5 interview questions for a Backend Engineer position."}]
+
+    async def per_request_sync_client():
+        # What the endpoints used to do: a new client per request and a blocking call
+        client = openai.OpenAI(api_key="mock", base_url=base_url)
+        response = client.chat.completions.create(model="mock", messages=messages, max_tokens=1000)
+        client.close()
+        return response.choices[0].message.content
+
+    async def run(label, call):
+        latencies = []
+        remaining = iter(range(args.requests))
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                await call()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        print(f"  {label:<22} {args.requests / elapsed:8.1f} req/s   "
+              f"p50 {latencies[len(latencies) // 2]:8.1f} ms   p95 {latencies[int(len(latencies) * 0.95)]:8.1f} ms")
+
+    async def measure():
+        print(f"LLM client benchmark: {args.requests} completions, {args.concurrency} in flight -> {base_url}")
+        await run("per-request sync", per_request_sync_client)
+        shared = LLMClient(api_key="mock", base_url=base_url, model="mock",
+                           max_connections=args.concurrency, max_concurrency=args.concurrency)
+        await run("shared async", lambda: shared.complete(messages))
+        await shared.aclose()
+
+    asyncio.run(measure())
+    if server is not None:
+        server.should_exit = True
+
+
+def _percentiles(latencies):
+    latencies = sorted(latencies)
+    return [latencies[min(len(latencies) - 1, int(len(latencies) * q))] for q in (0.5, 0.95, 0.99)]
+
+
+def bench_providers(args):
+    """Provider router tail latency with a degraded primary, with and without hedging/breakers"""
+    from llm import LLMClient
+    from providers import CircuitBreaker, Provider, ProviderRouter, ProvidersUnavailable, RollingStats
+
+    primary_url, _ = _start_mock_llm(args.delay, slow_rate=args.slow_rate, slow_delay=args.slow_delay)
+    hanging_url, _ = _start_mock_llm(args.delay, slow_rate=1.0, slow_delay=60)
+    secondary_url, _ = _start_mock_llm(args.delay)
+    messages = [{"role": "user", "content": "Generate 5 interview questions for a Backend Engineer position."}]
+
+    def build(primary_url, hedging, breaker_threshold):
+        def provider(name, url):
+            client = LLMClient(api_key="mock", base_url=url, model="mock", timeout=args.timeout,
+                               max_connections=args.concurrency, max_concurrency=args.concurrency, max_retries=0)
+            return Provider(name, client, CircuitBreaker(breaker_threshold, 30.0), RollingStats())
+        return ProviderRouter([provider("primary", primary_url), provider("secondary", secondary_url)],
+                              deadline=args.timeout * 2, hedging=hedging, hedge_min_delay=args.delay * 1.5,
+                              hedge_initial_delay=args.delay * 5)
+
+    async def run(label, router):
+        latencies = []
+        failures = 0
+        remaining = iter(range(args.requests))
+
+        async def worker():
+            nonlocal failures
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    await router.complete(messages)
+                except ProvidersUnavailable:
+                    failures += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        p50, p95, p99 = _percentiles(latencies)
+        print(f"  {label:<34} p50 {p50:7.0f} ms  p95 {p95:7.0f} ms  p99 {p99:7.0f} ms  "
+              f"wins {router.wins}  hedges {router.hedges}  failed {failures}")
+        await router.aclose()
+
+    async def measure():
+        print(f"Provider router benchmark: {args.requests} completions, {args.concurrency} in flight, "
+              f"{args.delay * 1000:.0f} ms base latency")
+        print(f" primary with {args.slow_rate:.0%} slow responses ({args.slow_delay:.1f} s):")
+        await run("no hedging", build(primary_url, False, 10 ** 6))
+        await run("hedging after p95", build(primary_url, True, 5))
+        print(f" primary hanging (client timeout {args.timeout:.1f} s):")
+        await run("sequential failover, no breaker", build(hanging_url, False, 10 ** 6))
+        await run("circuit breaker + hedging", build(hanging_url, True, 5))
+
+    asyncio.run(measure())
+
+
+def bench_question_bank(args):
+    """TF-IDF question bank: index build time and query latency"""
+    _setup_database(args.database_url)
+    import random
+    from question_bank import QuestionBank
+    from schemas import QuestionRequest
+
+    rng = random.Random(42)
+    seniority = ["Junior", "Senior", "Staff", "Lead", "Principal", ""]
+    stacks = ["React", "Python", "Java", "Go", "Rust", "Node.js", "Data", "ML", "iOS", "Android", "DevOps", "QA"]
+    roles = ["Developer", "Engineer", "Analyst", "Architect", "Scientist", "Manager"]
+    words = ("api design testing cloud aws kubernetes sql microservices performance security frontend backend "
+             "mobile pipelines agile mentoring architecture scalability monitoring typescript spark").split()
+    types = ["Technical", "Behavioral", "Experience"]
+    questions = [{"question": f"Question {n}", "type": "technical"} for n in range(5)]
+
+    def request(title):
+        return QuestionRequest(job_title=title, job_description=" ".join(rng.sample(words, 8)),
+                               interview_type=rng.choice(types), num_questions=5)
+
+    bank = QuestionBank(threshold=0.6, rebuild_interval=0)
+    for n in range(args.entries):
+        req = request(f"{rng.choice(seniority)} {rng.choice(stacks)} {rng.choice(roles)} {n % 97}")
+        bank._add_entry(bank._entry(str(n), req.job_title, req.job_description, req.interview_type,
+                                    req.difficulty_level, questions))
+
+    builds = []
+    for _ in range(max(1, args.repeat // 5)):
+        bank.rebuild()
+        builds.append(bank.build_ms)
+    queries = [request(f"{rng.choice(seniority)} {rng.choice(stacks)} {rng.choice(roles)}") for _ in range(args.queries)]
+    latencies = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += bank.match(query) is not None
+        latencies.append((time.perf_counter() - start) * 1000)
+    p50, p95, p99 = _percentiles(latencies)
+    print(f"Question bank benchmark: {args.entries} entries, vocabulary {len(bank._snapshot[0].vocabulary)}")
+    print(f"  build  {statistics.median(builds):8.1f} ms (median of {len(builds)})")
+    print(f"  query  p50 {p50:6.3f} ms  p95 {p95:6.3f} ms  p99 {p99:6.3f} ms  ({args.queries} queries, {hits / len(queries):.0%} above threshold)")
+
+
+def bench_scoring(args):
+    """Feedback keyword scoring on long transcripts: compiled scorer vs the original loop and per-keyword scans"""
+    import random
+    import re
+    from collections import Counter
+    from scoring import DEFAULT_LEXICONS, feedback_scorer, transcript_turns
+
+    rng = random.Random(42)
+    # "showed" contains the keyword "how": a substring test counts it, a word-bounded match does not
+    filler = ("the a we i built service using my previous job at company where our customers loved "
+              "scaling performance tests shipped features because deadline showed others").split()
+    lexicon = DEFAULT_LEXICONS["default"]
+    keywords = lexicon["technical"] + lexicon["communication"]
+    conversation = [
+        {"role": "assistant" if n % 2 == 0 else "user",
+         "content": " ".join(rng.choice(keywords) if rng.random() < args.density else rng.choice(filler)
+                             for _ in range(args.words))}
+        for n in range(args.turns)
+    ]
+
+    def original(conversation=conversation):
+        # The loop that was copy-pasted into both feedback endpoints
+        conversation_text = ""
+        for conv in conversation:
+            role = "Interviewer" if conv['role'] == 'assistant' else "Candidate"
+            conversation_text += f"{role}: {conv['content']}\n"
+        conversation_text_lower = conversation_text.lower()
+        return (sum(1 for keyword in lexicon["technical"] if keyword in conversation_text_lower),
+                sum(1 for keyword in lexicon["communication"] if keyword in conversation_text_lower))
+
+    categories = {keyword: category for category in ("technical", "communication") for keyword in lexicon[category]}
+    patterns = [(re.compile(r"(?<!\w)" + re.escape(keyword) + r"(?!\w)"), keyword) for keyword in keywords]
+
+    def per_keyword():
+        # The original loop extended to the compiled scorer's output: word-bounded counts per turn
+        turn_counts, found = [], set()
+        for turn in transcript_turns(conversation):
+            text = turn.lower()
+            counts = Counter()
+            for pattern, keyword in patterns:
+                hits = len(pattern.findall(text))
+                if hits:
+                    counts[categories[keyword]] += hits
+                    found.add(keyword)
+            turn_counts.append(dict(counts))
+        return turn_counts, found
+
+    def compiled():
+        return feedback_scorer.score(conversation, "Engineer", "Technical")
+
+    def original_live():
+        # Live scoring with the original loop: rescore the whole transcript after every turn
+        for n in range(1, len(conversation) + 1):
+            original(conversation[:n])
+
+    turns = transcript_turns(conversation)
+
+    def compiled_live():
+        score = feedback_scorer.start("Engineer", "Technical")
+        for turn in turns:
+            score.add_turns([turn])
+            score.running()
+        return score
+
+    def timed(call):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            call()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
+
+    original_ms, per_keyword_ms, compiled_ms = timed(original), timed(per_keyword), timed(compiled)
+    original_live_ms, compiled_live_ms = timed(original_live), timed(compiled_live)
+    print(f"Scoring benchmark: {args.turns} turns x {args.words} words, keyword density {args.density:.0%}")
+    print(" whole transcript:")
+    print(f"  original loop (substring presence only)   {original_ms:8.2f} ms")
+    print(f"  per-keyword scans, word-bounded per turn  {per_keyword_ms:8.2f} ms")
+    print(f"  compiled scorer, word-bounded per turn    {compiled_ms:8.2f} ms   "
+          f"({per_keyword_ms / compiled_ms:.1f}x faster than per-keyword, {compiled_ms / original_ms:.0f}x the original)")
+    print(" live, scores after every turn:")
+    print(f"  original loop, rescoring the transcript   {original_live_ms:8.2f} ms")
+    print(f"  compiled scorer, incremental              {compiled_live_ms:8.2f} ms   "
+          f"({original_live_ms / compiled_live_ms:.1f}x faster, {compiled_live_ms / args.turns * 1000:.0f} us per turn)")
+
+    score = compiled()
+    turn_counts, found = per_keyword()
+    status = "✅" if (score.turn_counts, set().union(*score.terms.values())) == (turn_counts, found) else "❌"
+    print(f"{status} compiled scorer matches the per-keyword scans: {sum(sum(c.values()) for c in turn_counts)} hits, "
+          f"technical {score.technical_mentions}, communication {score.communication_quality} distinct terms "
+          f"(the original substring test counts {original()})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="Benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--repeat", type=int, default=20)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    listing = subparsers.add_parser("listing", help="Full vs summary interview listing")
+    listing.add_argument("--rows", type=int, default=20000)
+    listing.add_argument("--page-size", type=int, default=50)
+    listing.set_defaults(func=bench_listing)
+
+    concurrency = subparsers.add_parser("concurrency", help="Parallel load against a running server")
+    concurrency.add_argument("--url", default="http://localhost:8080/api/interviews/my?fields=summary")
+    concurrency.add_argument("--concurrency", type=int, default=50)
+    concurrency.add_argument("--requests", type=int, default=2000)
+    concurrency.set_defaults(func=bench_concurrency)
+
+    llm = subparsers.add_parser("llm", help="Concurrent question generation against a mock LLM server")
+    llm.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint (default: in-process mock server)")
+    llm.add_argument("--delay", type=float, default=0.5, help="Mock completion latency in seconds")
+    llm.add_argument("--concurrency", type=int, default=20)
+    llm.add_argument("--requests", type=int, default=100)
+    llm.set_defaults(func=bench_llm)
+
+    providers = subparsers.add_parser("providers", help="Provider router tail latency against degraded mock providers")
+    providers.add_argument("--delay", type=float, default=0.2, help="Base mock completion latency in seconds")
+    providers.add_argument("--slow-rate", type=float, default=0.04)
+    providers.add_argument("--slow-delay", type=float, default=3.0)
+    providers.add_argument("--timeout", type=float, default=5.0, help="Per-provider client timeout in seconds")
+    providers.add_argument("--concurrency", type=int, default=10)
+    providers.add_argument("--requests", type=int, default=200)
+    providers.set_defaults(func=bench_providers)
+
+    bank = subparsers.add_parser("question-bank", help="TF-IDF question bank build time and query latency")
+    bank.add_argument("--entries", type=int, default=20000)
+    bank.add_argument("--queries", type=int, default=2000)
+    bank.set_defaults(func=bench_question_bank)
+
+    scoring = subparsers.add_parser("scoring", help="Feedback keyword scoring on long transcripts")
+    scoring.add_argument("--turns", type=int, default=500)
+    scoring.add_argument("--words", type=int, default=60, help="Words per turn")
+    scoring.add_argument("--density", type=float, default=0.05, help="Fraction of words that are keywords")
+    scoring.set_defaults(func=bench_scoring)
+
+    args = parser.parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
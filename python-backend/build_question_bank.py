@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Seed the question bank from questions already stored on interviews
+
+Only model-generated lists (items with a "question" key) are copied; the canned
+fallback questions are skipped. Interviews that normalize to the same request
+keep a single bank entry, so the script can be re-run safely.
+
+Usage:
+    python build_question_bank.py [--batch-size 500]
+"""
+
+import argparse
+
+from sqlalchemy import select
+
+from database import Base, SessionLocal, engine
+from models import Interview, QuestionBankEntry, parse_json_value
+from question_cache import question_cache_key
+from schemas import QuestionRequest
+
+
+def generated_questions(value):
+    questions = parse_json_value(value)
+    if isinstance(questions, dict):
+        questions = questions.get("question")
+    if not isinstance(questions, list) or not questions:
+        return None
+    if not all(isinstance(item, dict) and item.get("question") for item in questions):
+        return None
+    return questions
+
+
+def build(batch_size):
+    Base.metadata.create_all(bind=engine, tables=[QuestionBankEntry.__table__])
+    db = SessionLocal()
+    known = set(db.execute(select(QuestionBankEntry.request_key)).scalars())
+    added = skipped = 0
+    last_id = 0
+    try:
+        while True:
+            interviews = db.execute(
+                select(Interview.id, Interview.job_title, Interview.description,
+                       Interview.interview_type, Interview.questions)
+                .where(Interview.id > last_id, Interview.questions.isnot(None))
+                .order_by(Interview.id)
+                .limit(batch_size)
+            ).all()
+            if not interviews:
+                break
+            last_id = interviews[-1].id
+
+            for interview in interviews:
+                questions = generated_questions(interview.questions)
+                if questions is None or not interview.job_title:
+                    skipped += 1
+                    continue
+                request = QuestionRequest(
+                    job_title=interview.job_title,
+                    job_description=interview.description,
+                    interview_type=interview.interview_type or "Technical",
+                    num_questions=len(questions),
+                )
+                key = question_cache_key(request, "bank")
+                if key in known:
+                    skipped += 1
+                    continue
+                known.add(key)
+                db.add(QuestionBankEntry(
+                    request_key=key,
+                    job_title=request.job_title,
+                    description=request.job_description,
+                    interview_type=request.interview_type,
+                    difficulty_level=request.difficulty_level,
+                    questions=questions,
+                ))
+                added += 1
+            db.commit()
+            print(f"  processed interviews up to id {last_id}: {added} added")
+    finally:
+        db.close()
+    print(f"✅ Question bank seeded: {added} entries added, {skipped} interviews skipped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    build(args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Response caches with pluggable backends
+
+The in-process LRU+TTL backend is the default. Set CACHE_BACKEND=redis to share
+entries (and invalidations) between workers; that needs the optional `redis` package.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+
+class CacheBackend:
+    """Async byte cache interface"""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _record(self, value):
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCache(CacheBackend):
+    """LRU cache with a per-entry TTL, local to this worker process"""
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float):
+        super().__init__(namespace)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._record(self.get_nowait(key))
+
+    def get_nowait(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.set_nowait(key, value)
+
+    def set_nowait(self, key: str, value) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._entries), "maxsize": self.maxsize, "evictions": self.evictions}
+
+
+class RedisCache(CacheBackend):
+    """Shared cache for multi-worker deployments"""
+
+    def __init__(self, namespace: str, url: str, ttl: float):
+        super().__init__(namespace)
+        import redis.asyncio as redis
+
+        self.ttl = ttl
+        self._client = redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._record(await self._client.get(self._key(key)))
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._client.set(self._key(key), value, px=int(self.ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+
+def create_cache(namespace: str, maxsize: int, ttl: float) -> CacheBackend:
+    if settings.cache_backend == "redis":
+        return RedisCache(namespace, settings.cache_redis_url, ttl)
+    return MemoryCache(namespace, maxsize, ttl)
+
+
+# Serialized single-interview payloads, keyed by owner and interview id
+interview_cache = create_cache("interview", settings.interview_cache_maxsize, settings.interview_cache_ttl)
+
+
+def interview_cache_key(user_id: Optional[int], interview_id: int) -> str:
+    return f"{user_id}:{interview_id}"
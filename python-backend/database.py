@@ -1,14 +1,127 @@
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from config import settings
 
-# Create database engine
-engine = create_engine(settings.database_url)
+# Async drivers used for each sync database URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Translate the configured (sync) database URL to its async driver"""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+class PoolMetrics:
+    """Checkout counters for one connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            checkouts, timeouts = self.checkouts, self.timeouts
+            wait_total, wait_max = self.wait_total, self.wait_max
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # QueuePool.overflow() starts at -pool_size; only positive values are overflow connections
+            "overflow": max(0, pool.overflow()),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "avg_wait_ms": round(wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "max_wait_ms": round(wait_max * 1000, 3),
+        }
+
+class InstrumentedPoolMixin:
+    """Times every pool checkout, including waits for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_options(poolclass) -> dict:
+    """Pool settings from config; SQLite keeps the driver's default pool"""
+    if settings.database_url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+# Create database engine (used by scripts, migrations and table creation)
+engine = create_engine(settings.database_url, **pool_options(InstrumentedQueuePool))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory used by the request handlers
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    **pool_options(InstrumentedAsyncQueuePool)
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+def get_pool_metrics() -> dict:
+    """Live pool state for this worker process"""
+    pools = {"async": async_engine.sync_engine.pool, "sync": engine.pool}
+    return {
+        "pid": os.getpid(),
+        **{
+            name: pool.metrics.snapshot(pool) if hasattr(pool, "metrics") else {"status": pool.status()}
+            for name, pool in pools.items()
+        },
+    }
+
 # Create base class for models
 Base = declarative_base()
 
@@ -19,3 +132,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
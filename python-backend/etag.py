@@ -0,0 +1,52 @@
+"""
+Strong ETags for interview resources, derived from row versions
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Response, status
+
+# Let browsers keep responses but always revalidate them with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def _version(row) -> str:
+    return f"{row.id}@{row.version}"
+
+
+def row_etag(row) -> str:
+    """ETag of one interview representation; row needs id and version"""
+    digest = hashlib.sha1(_version(row).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def list_etag(rows: Iterable, variant: str, next_cursor: Optional[str] = None) -> str:
+    """ETag of one listing page; variant distinguishes the full and summary representations"""
+    digest = hashlib.sha1(variant.encode())
+    for row in rows:
+        digest.update(b"|" + _version(row).encode())
+    digest.update(b"|" + (next_cursor or "").encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so a W/ prefix is ignored"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
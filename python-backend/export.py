@@ -0,0 +1,99 @@
+"""
+Streaming NDJSON/CSV export of interviews and their parsed feedback
+"""
+
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import Interview, parse_json_value
+
+# Rows fetched per round trip on the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+CSV_COLUMNS = [
+    "id",
+    "job_title",
+    "interview_type",
+    "duration",
+    "created_by",
+    "user_name",
+    "created_at",
+    "question_count",
+    "overall_score",
+    "recommendation",
+    "technical_skills",
+    "communication",
+    "problem_solving",
+    "experience",
+]
+
+
+def _record(row) -> dict:
+    return {
+        "id": row.id,
+        "job_title": row.job_title,
+        "description": row.description,
+        "interview_type": row.interview_type,
+        "duration": row.duration,
+        "created_by": row.created_by,
+        "user_name": row.user_name,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "questions": parse_json_value(row.questions),
+        "feedback": parse_json_value(row.feedback),
+    }
+
+
+def _csv_values(record: dict) -> list:
+    questions = record["questions"]
+    if isinstance(questions, dict):
+        questions = questions.get("question")
+    feedback = record["feedback"] if isinstance(record["feedback"], dict) else {}
+    ratings = feedback.get("ratings") or {}
+    return [
+        record["id"],
+        record["job_title"],
+        record["interview_type"],
+        record["duration"],
+        record["created_by"],
+        record["user_name"],
+        record["created_at"],
+        len(questions) if isinstance(questions, list) else None,
+        feedback.get("overallScore"),
+        feedback.get("recommendation"),
+        ratings.get("technicalSkills"),
+        ratings.get("communication"),
+        ratings.get("problemSolving"),
+        ratings.get("experience"),
+    ]
+
+
+async def stream_interviews(filters, export_format: str) -> AsyncIterator[str]:
+    """
+    Yield the export one batch at a time.
+
+    The query runs on its own session over a server-side cursor, so only
+    EXPORT_BATCH_SIZE rows are held in memory at any point, and the session
+    lives exactly as long as the response body is being streamed.
+    """
+    async with AsyncSessionLocal() as db:
+        stmt = filters(select(*Interview.__table__.columns)).order_by(Interview.id)
+        result = await db.stream(stmt, execution_options={"yield_per": EXPORT_BATCH_SIZE})
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_COLUMNS)
+            yield buffer.getvalue()
+            async for batch in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(_csv_values(_record(row)) for row in batch)
+                yield buffer.getvalue()
+        else:
+            async for batch in result.partitions():
+                yield "".join(json.dumps(_record(row), default=str) + "\n" for row in batch)
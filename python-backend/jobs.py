@@ -0,0 +1,220 @@
+"""
+Background question generation for create-with-questions
+
+In async mode the endpoint stores a pending interview and enqueues a job here.
+A fixed number of workers drain a bounded queue, so LLM latency no longer holds
+the HTTP request open. The job id is the interview id: the row's status
+(pending -> running -> ready/failed) is the source of truth, and the in-process
+events only wake up status streams early.
+
+A worker claims its row (pending -> running, one conditional UPDATE) before
+generating, so with several server processes each interview is generated
+once. Every QUESTION_JOB_SWEEP_INTERVAL seconds each process also claims, up to
+its free queue capacity, interviews nobody is working on: pending for longer
+than the sweep interval (left by a restart, or by a full queue) or running for
+longer than QUESTION_JOB_TIMEOUT (their process died).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+
+from cache import interview_cache, interview_cache_key
+from config import settings
+from database import AsyncSessionLocal
+from models import Interview, sortable_time
+from schemas import QuestionRequest
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+# Statuses of interviews whose questions are still being generated
+IN_PROGRESS = (PENDING, RUNNING)
+
+
+def question_request_for(interview) -> QuestionRequest:
+    return QuestionRequest(
+        job_title=interview.job_title or "",
+        job_description=interview.description,
+        interview_type=interview.interview_type or "Technical",
+        difficulty_level="medium",
+        num_questions=5,
+    )
+
+
+class QuestionJobQueue:
+    def __init__(self, workers: int, maxsize: int, sweep_interval: float, job_timeout: float):
+        self.workers = workers
+        self.maxsize = maxsize
+        self.sweep_interval = sweep_interval
+        self.job_timeout = job_timeout
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.claimed_elsewhere = 0
+        self.recovered = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._finished: Dict[int, asyncio.Event] = {}
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxsize)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def start(self) -> None:
+        """Start the workers and the sweep for interviews left pending or orphaned"""
+        self._ensure_started()
+        self._tasks.append(asyncio.create_task(self._sweep_loop()))
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"❌ Question job sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def sweep(self) -> int:
+        """Claim and queue unattended interviews, at most as many as the queue has room for"""
+        free = self.maxsize - self._queue.qsize()
+        if free <= 0:
+            return 0
+        now = datetime.now(timezone.utc)
+        stale_pending = now - timedelta(seconds=self.sweep_interval)
+        stale_running = now - timedelta(seconds=self.job_timeout)
+        unattended = or_(
+            and_(Interview.status == PENDING, sortable_time(Interview.updated_at) < sortable_time(stale_pending)),
+            and_(Interview.status == RUNNING, sortable_time(Interview.updated_at) < sortable_time(stale_running)),
+        )
+        candidates = select(Interview.id).where(unattended).order_by(Interview.id).limit(free)
+        async with AsyncSessionLocal() as db:
+            # The outer condition is re-checked under the row lock, so two processes never claim the same row
+            result = await db.execute(
+                update(Interview)
+                .where(Interview.id.in_(candidates.scalar_subquery()), unattended)
+                .values(status=RUNNING)
+                .returning(Interview.id, Interview.user_id, Interview.job_title, Interview.description,
+                           Interview.interview_type)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            await db.commit()
+        for row in rows:
+            if self._enqueue(row.id, row.user_id, question_request_for(row), claimed=True):
+                self.recovered += 1
+            else:
+                await self._release([row.id])
+        return len(rows)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, interview_id: int, user_id: Optional[int], request: QuestionRequest) -> bool:
+        """Queue a generation job for a pending interview; False when the queue is full"""
+        return self._enqueue(interview_id, user_id, request, claimed=False)
+
+    def _enqueue(self, interview_id: int, user_id: Optional[int], request: QuestionRequest, claimed: bool) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((interview_id, user_id, request, claimed))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self._finished.setdefault(interview_id, asyncio.Event())
+        self.submitted += 1
+        return True
+
+    async def _release(self, interview_ids: List[int]) -> None:
+        """Hand claimed interviews back to the next sweep"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Interview)
+                .where(Interview.id.in_(interview_ids), Interview.status == RUNNING)
+                .values(status=PENDING)
+            )
+            await db.commit()
+
+    async def _claim(self, interview_id: int) -> bool:
+        """pending -> running; False when another process claimed the interview first"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Interview)
+                .where(Interview.id == interview_id, Interview.status == PENDING)
+                .values(status=RUNNING)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def wait(self, interview_id: int, timeout: float) -> None:
+        """Return when the job finishes in this process, or after timeout"""
+        event = self._finished.get(interview_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self) -> None:
+        while True:
+            interview_id, user_id, request, claimed = await self._queue.get()
+            try:
+                if claimed or await self._claim(interview_id):
+                    await self._run(interview_id, user_id, request)
+                else:
+                    self.claimed_elsewhere += 1
+            except Exception as e:
+                print(f"❌ Question job for interview {interview_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+                event = self._finished.pop(interview_id, None)
+                if event is not None:
+                    event.set()
+
+    async def _run(self, interview_id: int, user_id: Optional[int], request: QuestionRequest) -> None:
+        from routers.ai_questions import generate_question_list
+
+        try:
+            questions = await generate_question_list(request)
+            values = {"questions": {"question": questions}, "status": READY}
+            self.completed += 1
+        except Exception as e:
+            print(f"❌ Question generation for interview {interview_id} failed: {e}")
+            values = {"status": FAILED}
+            self.failed += 1
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Interview)
+                .where(Interview.id == interview_id, Interview.status == RUNNING)
+                .values(**values)
+            )
+            await db.commit()
+        await interview_cache.delete(interview_cache_key(user_id, interview_id))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "maxsize": self.maxsize,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "recovered": self.recovered,
+            "claimed_elsewhere": self.claimed_elsewhere,
+        }
+
+
+question_jobs = QuestionJobQueue(settings.question_job_workers, settings.question_job_queue_size,
+                                 settings.question_job_sweep_interval, settings.question_job_timeout)
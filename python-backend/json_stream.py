@@ -0,0 +1,73 @@
+"""
+Incremental parsing of a JSON array that arrives in chunks
+
+Used for streamed completions: each array element is decoded as soon as its
+closing bracket (or the following comma) arrives, without waiting for the
+rest of the response. Text before the opening '[' is ignored, as in the
+non-streaming parser.
+"""
+
+import json
+from typing import Any, List
+
+
+class JSONArrayStream:
+    def __init__(self):
+        self.started = False
+        self.complete = False
+        self.errors = 0
+        self._element: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume a chunk and return the elements it completed"""
+        items = []
+        for ch in text:
+            if self.complete:
+                break
+            if not self.started:
+                self.started = ch == "["
+                continue
+            if self._in_string:
+                self._element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # The closing bracket of the array itself
+                    self._flush(items)
+                    self.complete = True
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    # An object or nested array element is complete at its own closing bracket
+                    self._element.append(ch)
+                    self._flush(items)
+                    continue
+            elif ch == "," and self._depth == 0:
+                self._flush(items)
+                continue
+            self._element.append(ch)
+        return items
+
+    def _flush(self, items: List[Any]) -> None:
+        text = "".join(self._element).strip()
+        self._element = []
+        if not text:
+            return
+        try:
+            items.append(json.loads(text))
+        except json.JSONDecodeError:
+            # A malformed element is skipped; the rest of the array still streams
+            self.errors += 1
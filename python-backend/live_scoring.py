@@ -0,0 +1,127 @@
+"""
+Live feedback scoring while an interview call is running
+
+The client streams conversation turns over the /api/interviews/{id}/live
+WebSocket as Vapi emits them. Each turn is scanned once and added to a running
+TranscriptScore, so an update costs time proportional to the new turn only.
+The transcript is saved to interview_transcript every LIVE_CHECKPOINT_TURNS
+turns or LIVE_CHECKPOINT_INTERVAL seconds, and again when the connection
+drops; reconnecting to the same interview resumes from the saved turns.
+
+When the client sends {"type": "end"}, the final feedback is built from the
+running score (stamped like build_feedback, so a later POST /{id}/feedback with
+the same conversation returns it without rescoring) and stored with the
+transcript.
+"""
+
+import time
+from typing import Any, List, Optional
+
+from cache import interview_cache, interview_cache_key
+from config import settings
+from database import AsyncSessionLocal
+from models import Interview
+from scoring import feedback_scorer, stamp_feedback, transcript_turns
+from transcripts import load_transcript, save_transcript
+
+
+def message_turns(message: Any) -> Optional[List[Any]]:
+    """Turns carried by a client message: {"turns": [...]} or a single turn object"""
+    if not isinstance(message, dict):
+        return None
+    if "turns" in message:
+        turns = message["turns"]
+        return turns if isinstance(turns, list) else None
+    if "turn" in message:
+        return [message["turn"]]
+    if ("role" in message and "content" in message) or "question" in message:
+        return [message]
+    return None
+
+
+class LiveSession:
+    def __init__(self, interview: Interview, conversation: List[Any], stats: "LiveScoringStats"):
+        self.interview_id = interview.id
+        self.user_id = interview.user_id
+        self.job_title = interview.job_title
+        self.conversation = list(conversation)
+        self.score = feedback_scorer.start(interview.job_title, interview.interview_type)
+        self.score.add_turns(transcript_turns(self.conversation))
+        self.saved_turns = len(self.conversation)
+        self.saved_at = time.monotonic()
+        self.finished = False
+        self._stats = stats
+
+    @classmethod
+    async def open(cls, interview: Interview, stats: "LiveScoringStats") -> "LiveSession":
+        """A session for the interview, resumed from its saved transcript if there is one"""
+        async with AsyncSessionLocal() as db:
+            turns = await load_transcript(db, interview.id) or []
+        if turns:
+            stats.resumed += 1
+        return cls(interview, turns, stats)
+
+    def add(self, turns: List[Any]) -> None:
+        start = len(self.conversation)
+        self.conversation += turns
+        self.score.add_turns(transcript_turns(turns, start))
+        self._stats.turns += len(turns)
+
+    def checkpoint_due(self) -> bool:
+        unsaved = len(self.conversation) - self.saved_turns
+        return unsaved >= settings.live_checkpoint_turns or (
+            unsaved > 0 and time.monotonic() - self.saved_at >= settings.live_checkpoint_interval
+        )
+
+    async def checkpoint(self) -> None:
+        """Save the transcript if it has turns that are not saved yet"""
+        if len(self.conversation) == self.saved_turns:
+            return
+        async with AsyncSessionLocal() as db:
+            await save_transcript(db, self.interview_id, self.conversation)
+            await db.commit()
+        self.saved_turns = len(self.conversation)
+        self.saved_at = time.monotonic()
+        self._stats.checkpoints += 1
+
+    def running(self) -> dict:
+        return {**self.score.running(), "savedTurns": self.saved_turns}
+
+    async def finish(self) -> dict:
+        """Store the final feedback and transcript; returns the feedback"""
+        feedback = stamp_feedback(self.score.feedback(self.job_title), self.conversation)
+        async with AsyncSessionLocal() as db:
+            interview = await db.get(Interview, self.interview_id)
+            interview.feedback = feedback
+            await save_transcript(db, self.interview_id, self.conversation)
+            await db.commit()
+        await interview_cache.delete(interview_cache_key(self.user_id, self.interview_id))
+        self.saved_turns = len(self.conversation)
+        self.finished = True
+        self._stats.finished += 1
+        return feedback
+
+
+class LiveScoringStats:
+    def __init__(self):
+        self.active = 0
+        self.sessions = 0
+        self.resumed = 0
+        self.turns = 0
+        self.checkpoints = 0
+        self.finished = 0
+        self.dropped = 0
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "sessions": self.sessions,
+            "resumed": self.resumed,
+            "turns": self.turns,
+            "checkpoints": self.checkpoints,
+            "finished": self.finished,
+            "dropped": self.dropped,
+        }
+
+
+live_scoring = LiveScoringStats()
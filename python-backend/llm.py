@@ -0,0 +1,144 @@
+"""
+Process-wide async clients for chat completions
+
+Each configured provider gets one AsyncOpenAI client, backed by a pooled
+keep-alive HTTP client, created in the app lifespan (see providers.py) and
+shared by every request. A semaphore caps the number of completions in flight
+so bursts queue here instead of at the provider.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+import httpx
+import openai
+
+from prompts import record_completion_tokens
+
+
+class LLMClient:
+    """Shared chat completion client with connection pooling and a concurrency cap"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        max_concurrency: int = 16,
+        max_retries: int = 1,
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        self._client = openai.AsyncOpenAI(
+            api_key=api_key or "missing",
+            base_url=base_url or None,
+            http_client=self._http,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._total_seconds = 0.0
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+    ) -> str:
+        """Run one chat completion and return the stripped message text"""
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                response = await self._client.chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self._total_seconds += time.perf_counter() - start
+            self.completed += 1
+            if response.usage is not None:
+                self.prompt_tokens += response.usage.prompt_tokens or 0
+                self.completion_tokens += response.usage.completion_tokens or 0
+                record_completion_tokens(response.usage.completion_tokens or 0)
+        return (response.choices[0].message.content or "").strip()
+
+    async def stream(
+        self,
+        messages: List[dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Run one streamed chat completion, yielding text deltas as they arrive"""
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                )
+                try:
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await stream.close()
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self._total_seconds += time.perf_counter() - start
+            self.completed += 1
+
+    def stats(self) -> dict:
+        calls = self.completed + self.failed
+        return {
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_ms": round(self._total_seconds / calls * 1000, 2) if calls else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        await self._client.close()
+        await self._http.aclose()
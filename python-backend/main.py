@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,11 +7,23 @@ import uvicorn
 import os
 from dotenv import load_dotenv
 
-from database import get_db, engine, Base
+from database import get_db, engine, async_engine, Base, get_pool_metrics
 from models import Interview, User
-from routers import auth, interviews, ai_feedback, ai_questions
+from routers import auth, interviews, ai_feedback, ai_questions, admin
+from routers.ai_questions import question_flight
 from auth import get_current_user, get_current_user_from_cookie
 from config import settings
+from cache import interview_cache
+from providers import close_provider_router, get_provider_router
+from question_cache import question_cache
+from jobs import question_jobs
+from question_bank import question_bank
+from warm_pool import warm_pool
+from question_validation import question_validator
+from prompts import TokenUsageMiddleware, prompt_stats
+from rate_limit import ai_admission
+from live_scoring import live_scoring
+from transcripts import transcript_stats
 
 # Load environment variables
 load_dotenv()
@@ -18,13 +31,34 @@ load_dotenv()
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled LLM client per provider per worker, shared by all requests
+    get_provider_router()
+    if settings.question_bank_enabled:
+        await question_bank.load()
+    await question_jobs.start()
+    if settings.warm_pool_enabled:
+        warm_pool.start()
+    yield
+    await warm_pool.stop()
+    await question_jobs.stop()
+    await close_provider_router()
+    question_cache.close()
+    # Close pooled async database connections on shutdown
+    await async_engine.dispose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Voicruit API",
     description="AI Voice Recruiter Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Per-request prompt/completion token headers and log lines
+app.add_middleware(TokenUsageMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +66,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Security
@@ -42,6 +77,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(interviews.router, prefix="/api/interviews", tags=["Interviews"])
 app.include_router(ai_feedback.router, prefix="/api/ai", tags=["AI Feedback"])
 app.include_router(ai_questions.router, prefix="/api/ai", tags=["AI Questions"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 # Add user endpoint for frontend compatibility
 @app.get("/api/user")
@@ -63,6 +99,25 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for this worker process"""
+    return {
+        "db_pool": get_pool_metrics(),
+        "ai_admission": ai_admission.stats(),
+        "interview_cache": interview_cache.stats(),
+        "llm": get_provider_router().stats(),
+        "question_cache": question_cache.stats(),
+        "question_singleflight": question_flight.stats(),
+        "question_validation": question_validator.stats(),
+        "prompts": prompt_stats.stats(),
+        "question_jobs": question_jobs.stats(),
+        "question_bank": question_bank.stats(),
+        "warm_pool": warm_pool.stats(),
+        "live_scoring": live_scoring.stats(),
+        "transcripts": transcript_stats.stats(),
+    }
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -4,6 +4,132 @@ Script to migrate the database to add user_id column
 """
 import psycopg2
 from config import settings
+from models import parse_json_value
+from transcripts import encode_turns
+
+def create_user_scoping(cursor):
+    """Foreign key and per-user listing index for interview.user_id"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.table_constraints
+        WHERE table_name = 'interview' AND constraint_name = 'interview_user_id_fkey'
+    """)
+    if cursor.fetchone() is None:
+        print("Adding interview.user_id foreign key...")
+        # NOT VALID skips the full-table check; existing rows are validated after the backfill
+        cursor.execute(
+            "ALTER TABLE interview ADD CONSTRAINT interview_user_id_fkey "
+            "FOREIGN KEY (user_id) REFERENCES users (id) NOT VALID"
+        )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_interview_user_created_at_id "
+        "ON interview (user_id, created_at DESC NULLS LAST, id DESC)"
+    )
+    print("✅ user_id foreign key and index are in place")
+
+def add_updated_at(cursor):
+    """Row version used for ETags; existing rows start at their creation time"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'interview' AND column_name = 'updated_at'
+    """)
+    if cursor.fetchone() is None:
+        print("Adding updated_at column to interview table...")
+        cursor.execute("ALTER TABLE interview ADD COLUMN updated_at TIMESTAMPTZ DEFAULT now()")
+        cursor.execute("UPDATE interview SET updated_at = COALESCE(created_at, now())")
+    print("✅ updated_at column is in place")
+
+def add_version(cursor):
+    """Row version used for ETags, incremented by every update"""
+    cursor.execute("ALTER TABLE interview ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1")
+    print("✅ version column is in place")
+
+def add_status(cursor):
+    """Question generation state for async create-with-questions jobs"""
+    cursor.execute("ALTER TABLE interview ADD COLUMN IF NOT EXISTS status VARCHAR(32) NOT NULL DEFAULT 'ready'")
+    print("✅ status column is in place")
+
+def create_listing_indexes(cursor):
+    """Create the indexes used by the paginated interview listing endpoints"""
+    print("Creating interview listing indexes...")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_created_at_id ON interview (created_at DESC NULLS LAST, id DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_job_title ON interview (job_title varchar_pattern_ops)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_interview_type ON interview (interview_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_created_by ON interview (created_by)")
+    print("✅ Listing indexes are in place")
+
+def migrate_json_columns(cursor):
+    """Convert questions/feedback from JSON text to JSONB and index the feedback keys we filter on"""
+    cursor.execute("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_name = 'interview' AND column_name IN ('questions', 'feedback')
+    """)
+    text_columns = [name for name, data_type in cursor.fetchall() if data_type != "jsonb"]
+    
+    if text_columns:
+        # Rows that do not hold valid JSON are kept as a JSON string instead of failing the migration
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION pg_temp.to_jsonb_safe(value text) RETURNS jsonb AS $$
+            BEGIN
+                RETURN value::jsonb;
+            EXCEPTION WHEN others THEN
+                RETURN to_jsonb(value);
+            END;
+            $$ LANGUAGE plpgsql IMMUTABLE
+        """)
+        for column in text_columns:
+            print(f"Converting interview.{column} to JSONB...")
+            cursor.execute(
+                f"ALTER TABLE interview ALTER COLUMN {column} TYPE JSONB "
+                f"USING pg_temp.to_jsonb_safe({column})"
+            )
+        print("✅ questions/feedback are stored as JSONB")
+    else:
+        print("✅ questions/feedback are already JSONB")
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_feedback_gin ON interview USING gin (feedback jsonb_path_ops)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_feedback_recommendation ON interview ((feedback ->> 'recommendation'))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_feedback_overall_score ON interview ((CAST((feedback ->> 'overallScore') AS FLOAT)))")
+    print("✅ Feedback indexes are in place")
+
+def compress_transcripts(cursor):
+    """Move interview_transcript.turns (JSON) into the compressed payload column"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'interview_transcript' AND column_name = 'turns'
+    """)
+    if cursor.fetchone() is None:
+        print("✅ transcripts are stored compressed")
+        return
+    print("Compressing interview transcripts...")
+    cursor.execute("""
+        ALTER TABLE interview_transcript
+            ADD COLUMN IF NOT EXISTS payload BYTEA,
+            ADD COLUMN IF NOT EXISTS codec VARCHAR(16),
+            ADD COLUMN IF NOT EXISTS turn_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS raw_size INTEGER NOT NULL DEFAULT 0
+    """)
+    # Server-side cursor: transcripts are read and rewritten 500 at a time
+    reader = cursor.connection.cursor(name="transcript_reader")
+    reader.itersize = 500
+    reader.execute("SELECT id, turns FROM interview_transcript WHERE payload IS NULL")
+    count = 0
+    for transcript_id, turns in reader:
+        turns = parse_json_value(turns) or []
+        payload, codec, raw_size = encode_turns(turns)
+        cursor.execute(
+            "UPDATE interview_transcript SET payload = %s, codec = %s, turn_count = %s, raw_size = %s WHERE id = %s",
+            (psycopg2.Binary(payload), codec, len(turns), raw_size, transcript_id)
+        )
+        count += 1
+    reader.close()
+    cursor.execute("""
+        ALTER TABLE interview_transcript
+            ALTER COLUMN payload SET NOT NULL,
+            ALTER COLUMN codec SET NOT NULL,
+            DROP COLUMN turns
+    """)
+    print(f"✅ {count} transcripts compressed")
 
 def migrate_database():
     try:
@@ -28,13 +154,20 @@ def migrate_database():
             print("Adding user_id column to interview table...")
             cursor.execute("ALTER TABLE interview ADD COLUMN user_id INTEGER")
             
-            # Set default user_id to 1 for existing records
-            cursor.execute("UPDATE interview SET user_id = 1 WHERE user_id IS NULL")
-            
+            # Existing records are assigned to their owners by backfill_user_id.py
             conn.commit()
-            print("✅ Successfully added user_id column")
+            print("✅ Successfully added user_id column (run backfill_user_id.py to populate it)")
         else:
             print("✅ user_id column already exists")
+        
+        create_user_scoping(cursor)
+        add_updated_at(cursor)
+        add_version(cursor)
+        add_status(cursor)
+        create_listing_indexes(cursor)
+        migrate_json_columns(cursor)
+        compress_transcripts(cursor)
+        conn.commit()
             
     except Exception as e:
         print(f"❌ Error: {e}")
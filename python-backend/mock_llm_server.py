@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible chat completion server for development and benchmarks
+
+Answers POST /v1/chat/completions with a JSON array of interview questions after
+a fixed delay, so question generation can be exercised without an API key.
+Output is "generated" at one chunk per --chunk-delay seconds after the initial
+delay: streaming requests ("stream": true) receive each chunk as it is produced,
+non-streaming ones get the whole completion once the last chunk is done.
+
+--fail-rate and --slow-rate inject errors (HTTP 500) and slow responses
+(--slow-delay seconds) to exercise provider failover and hedging.
+
+Usage:
+    python mock_llm_server.py [--port 8099] [--delay 0.5] [--chunk-delay 0.02]
+    LOCAL_LLM_BASE_URL=http://localhost:8099/v1 python main.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def _requested_count(prompt: str) -> int:
+    match = re.search(r"(\d+) interview questions", prompt)
+    return int(match.group(1)) if match else 5
+
+
+def _questions(prompt: str):
+    count = _requested_count(prompt)
+    return [
+        {
+            "question": f"Mock question {n + 1}: walk me through a recent problem you solved.",
+            "type": "technical",
+            "difficulty": "medium",
+            "expected_answer_length": "medium",
+        }
+        for n in range(count)
+    ]
+
+
+def create_app(delay=0.5, chunk_delay=0.02, chunk_size=16, fail_rate=0.0, slow_rate=0.0, slow_delay=5.0):
+    app = FastAPI(title="Mock LLM")
+    app.state.delay = delay
+    app.state.chunk_delay = chunk_delay
+    app.state.chunk_size = chunk_size
+    app.state.fail_rate = fail_rate
+    app.state.slow_rate = slow_rate
+    app.state.slow_delay = slow_delay
+
+    async def stream(completion_id: str, model: str, content: str):
+        def chunk(delta, finish_reason=None):
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }) + "\n\n"
+
+        yield chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(content), app.state.chunk_size):
+            await asyncio.sleep(app.state.chunk_delay)
+            yield chunk({"content": content[start:start + app.state.chunk_size]})
+        yield chunk({}, "stop")
+        yield "data: [DONE]\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        if random.random() < app.state.fail_rate:
+            return JSONResponse({"error": {"message": "mock failure", "type": "server_error"}}, status_code=500)
+        delay = app.state.slow_delay if random.random() < app.state.slow_rate else app.state.delay
+        await asyncio.sleep(delay)
+        content = json.dumps(_questions(prompt), indent=2)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        if body.get("stream"):
+            return StreamingResponse(stream(completion_id, body.get("model", "mock"), content), media_type="text/event-stream")
+        chunks = -(-len(content) // app.state.chunk_size)
+        await asyncio.sleep(chunks * app.state.chunk_delay)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": 0},
+        }
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds before each completion is returned")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Seconds between streamed chunks")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests delayed by --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=5.0)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.delay, args.chunk_delay, fail_rate=args.fail_rate,
+                   slow_rate=args.slow_rate, slow_delay=args.slow_delay),
+        host=args.host, port=args.port, log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,60 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, BigInteger
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, BigInteger, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, literal_column
+from sqlalchemy.sql.functions import FunctionElement
 from database import Base
+import json
+
+# Native JSONB on PostgreSQL, JSON text elsewhere (SQLite); SQL NULL rather than JSON null for None
+JSONColumn = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+def parse_json_value(value):
+    """Turn a JSON string from the API into the object stored in a JSON column"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+class json_field(FunctionElement):
+    """Text value of a top-level key of a JSON column (column ->> 'key')"""
+    type = Text()
+    inherit_cache = True
+
+@compiles(json_field)
+def _compile_json_field(element, compiler, **kw):
+    column, key = list(element.clauses)
+    return "json_extract(%s, '$.%s')" % (compiler.process(column, **kw), key.name.strip("'"))
+
+@compiles(json_field, "postgresql")
+def _compile_json_field_postgresql(element, compiler, **kw):
+    # Rendered with an inline key so it matches the expression indexes on interview.feedback
+    column, key = list(element.clauses)
+    return "(%s ->> %s)" % (compiler.process(column, **kw), key.name)
+
+def feedback_field(key: str):
+    return json_field(Interview.feedback, literal_column(f"'{key}'"))
+
+class sortable_time(FunctionElement):
+    """A timestamp column or value in a form that compares chronologically
+
+    SQLite keeps timestamps as text, and server defaults are written without the
+    fractional seconds SQLAlchemy adds to bound values ('12:00:00' sorts before
+    '12:00:00.000000'), so both sides are compared as julianday() numbers there.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(sortable_time)
+def _compile_sortable_time(element, compiler, **kw):
+    return compiler.process(list(element.clauses)[0], **kw)
+
+@compiles(sortable_time, "sqlite")
+def _compile_sortable_time_sqlite(element, compiler, **kw):
+    return "julianday(%s)" % compiler.process(list(element.clauses)[0], **kw)
 
 class User(Base):
     __tablename__ = "users"
@@ -14,25 +67,81 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # Relationships (commented out due to database schema issues)
-    # interviews = relationship("Interview", back_populates="user")
+    # Relationships
+    interviews = relationship("Interview", back_populates="user")
 
 class Interview(Base):
     __tablename__ = "interview"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     job_title = Column(String(255))
     description = Column(Text)
     duration = Column(String(255))
     interview_type = Column(String(255))
     created_by = Column(String(255))
     user_name = Column(String(255))
-    questions = Column(Text)
-    feedback = Column(Text)
+    questions = Column(JSONColumn)
+    feedback = Column(JSONColumn)
+    # Question generation state: "pending" until a worker claims it, "running" while its async job runs
+    # (see jobs.py), then "ready" or "failed"
+    status = Column(String(32), nullable=False, default="ready", server_default="ready")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Row version used for ETags: incremented by every ORM or Core UPDATE (timestamps can repeat within a second)
+    version = Column(Integer, nullable=False, default=1, server_default="1",
+                     onupdate=literal_column("version", Integer) + 1)
     
-    # Foreign key (commented out for now due to database schema)
-    # user_id = Column(Integer, ForeignKey("users.id"), nullable=True, default=1)
+    # Owner; nullable until existing rows are backfilled (see backfill_user_id.py)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
-    # Relationships (commented out due to database schema issues)
-    # user = relationship("User", back_populates="interviews")
+    # Relationships
+    user = relationship("User", back_populates="interviews")
+
+    __table_args__ = (
+        # Keyset pagination order for the listing endpoints (SQLite sorts NULLs last on DESC already)
+        Index("ix_interview_created_at_id", created_at.desc().nullslast(), id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_interview_created_at_id_default", created_at.desc(), id.desc()).ddl_if(callable_=lambda ddl, target, bind, **kw: kw["dialect"].name != "postgresql"),
+        # Per-user listings: one index range scan per page
+        Index("ix_interview_user_created_at_id", user_id, created_at.desc().nullslast(), id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_interview_user_created_at_id_default", user_id, created_at.desc(), id.desc()).ddl_if(callable_=lambda ddl, target, bind, **kw: kw["dialect"].name != "postgresql"),
+        # varchar_pattern_ops lets PostgreSQL use the index for job_title prefix (LIKE 'x%') filters
+        Index("ix_interview_job_title", "job_title", postgresql_ops={"job_title": "varchar_pattern_ops"}),
+        Index("ix_interview_interview_type", "interview_type"),
+        Index("ix_interview_created_by", "created_by"),
+        # Feedback lookups pushed down to SQL (PostgreSQL only)
+        Index("ix_interview_feedback_gin", "feedback", postgresql_using="gin",
+              postgresql_ops={"feedback": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_interview_feedback_recommendation",
+              text("(feedback ->> 'recommendation')")).ddl_if(dialect="postgresql"),
+        Index("ix_interview_feedback_overall_score",
+              text("(CAST((feedback ->> 'overallScore') AS FLOAT))")).ddl_if(dialect="postgresql"),
+    )
+
+class QuestionBankEntry(Base):
+    """Previously generated questions, reused for similar roles (see question_bank.py)"""
+    __tablename__ = "question_bank"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # Normalized request key (question_cache.question_cache_key); one entry per distinct request
+    request_key = Column(String(64), unique=True, nullable=False)
+    job_title = Column(String(255), nullable=False)
+    description = Column(Text)
+    interview_type = Column(String(255))
+    difficulty_level = Column(String(32))
+    questions = Column(JSONColumn, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class InterviewTranscript(Base):
+    """Conversation submitted with an interview's feedback, kept so feedback can be re-scored"""
+    __tablename__ = "interview_transcript"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(BigInteger().with_variant(Integer, "sqlite"), ForeignKey("interview.id", ondelete="CASCADE"),
+                          unique=True, nullable=False)
+    # Compressed NDJSON, one turn per line (see transcripts.py); only loaded when accessed
+    payload = deferred(Column(LargeBinary, nullable=False))
+    codec = Column(String(16), nullable=False)
+    turn_count = Column(Integer, nullable=False, default=0)
+    raw_size = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination helpers for interview listings
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Float, cast, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Interview, feedback_field, sortable_time
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns fetched for ?fields=summary; the questions/feedback Text columns are never selected
+SUMMARY_COLUMNS = (
+    Interview.id,
+    Interview.job_title,
+    Interview.interview_type,
+    Interview.duration,
+    Interview.user_name,
+    Interview.created_by,
+    Interview.created_at,
+    Interview.updated_at,
+    Interview.version,
+    Interview.status,
+    Interview.feedback.isnot(None).label("has_feedback"),
+)
+
+# Just enough to compute ETags (see etag.py) and page cursors without reading the heavy columns
+VERSION_COLUMNS = (
+    Interview.id,
+    Interview.created_at,
+    Interview.version,
+)
+
+
+def _time(value: datetime):
+    return sortable_time(literal(value, DateTime(timezone=True)))
+
+
+def encode_cursor(created_at: Optional[datetime], interview_id: int) -> str:
+    """Encode the (created_at, id) position of the last row of a page"""
+    payload = {
+        "c": created_at.isoformat() if created_at else None,
+        "i": interview_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["c"]) if payload["c"] else None
+        return created_at, int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def apply_filters(
+    query,
+    interview_type: Optional[str] = None,
+    created_by: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    job_title_prefix: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+):
+    """Apply the listing filters shared by the interview endpoints"""
+    if interview_type:
+        query = query.filter(Interview.interview_type == interview_type)
+    if created_by:
+        query = query.filter(Interview.created_by == created_by)
+    if created_after:
+        query = query.filter(sortable_time(Interview.created_at) >= _time(created_after))
+    if created_before:
+        query = query.filter(sortable_time(Interview.created_at) < _time(created_before))
+    if job_title_prefix:
+        query = query.filter(Interview.job_title.startswith(job_title_prefix, autoescape=True))
+    if recommendation:
+        query = query.filter(feedback_field("recommendation") == recommendation)
+    if min_score is not None:
+        query = query.filter(cast(feedback_field("overallScore"), Float) >= min_score)
+    if max_score is not None:
+        query = query.filter(cast(feedback_field("overallScore"), Float) <= max_score)
+    return query
+
+
+def keyset_before(created_at: datetime, interview_id: int):
+    """Rows after the (created_at, id) position in listing order; never matches rows without a timestamp
+
+    A row-value comparison, so PostgreSQL turns it into one range scan of
+    ix_interview_created_at_id instead of filtering every newer row.
+    """
+    return tuple_(sortable_time(Interview.created_at), Interview.id) < tuple_(_time(created_at), interview_id)
+
+
+async def _fetch(db: AsyncSession, query, limit: int):
+    result = await db.execute(query.order_by(
+        sortable_time(Interview.created_at).desc().nullslast(),
+        Interview.id.desc()
+    ).limit(limit))
+    # select(Interview) yields one-entity rows; column-only selects yield plain rows
+    return result.scalars().all() if len(query.column_descriptions) == 1 else result.all()
+
+
+async def paginate(db: AsyncSession, query, limit: int, cursor: Optional[str] = None):
+    """
+    Return one page of interviews ordered newest first, plus the cursor of the next page.
+
+    Rows are ordered by (created_at DESC NULLS LAST, id DESC) so the position of
+    the last row is enough to resume, no matter how many rows precede it. Rows
+    without a timestamp are paged as a separate trailing phase, by id alone.
+    """
+    undated = Interview.created_at.is_(None)
+    if not cursor:
+        rows = await _fetch(db, query, limit + 1)
+    else:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        if cursor_created_at is None:
+            rows = await _fetch(db, query.filter(undated, Interview.id < cursor_id), limit + 1)
+        else:
+            rows = await _fetch(db, query.filter(keyset_before(cursor_created_at, cursor_id)), limit + 1)
+            if len(rows) <= limit:
+                # The dated rows ran out on this page: fill it from the start of the undated ones
+                rows += await _fetch(db, query.filter(undated), limit + 1 - len(rows))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, next_cursor
@@ -0,0 +1,202 @@
+"""
+Token-aware prompt building for question and feedback prompts
+
+Token counts come from the optional `tiktoken` package when it is installed,
+otherwise from a ~4 characters per token estimate. Free-text inputs (job
+descriptions) are compacted (whitespace collapsed, repeated lines dropped) and
+then cut to a token budget, keeping their head and tail.
+
+Messages are laid out static-first: the system message holds only fixed
+instructions and the request-specific details come last, so consecutive
+requests share an identical prefix that providers can cache.
+
+Tokens are also reported per request: TokenUsageMiddleware adds
+X-Prompt-Tokens (measured here) and X-Completion-Tokens (as reported by the
+provider) to the response headers and logs them when the request ends, which
+covers streamed responses whose headers go out before the completion.
+"""
+
+import re
+from contextvars import ContextVar
+from typing import List, Optional
+
+CHARS_PER_TOKEN = 4
+# Per-message overhead of the chat format (role and separators)
+MESSAGE_TOKENS = 4
+ELISION = "[...]"
+
+_encoding = None
+
+
+def _tiktoken_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _tiktoken_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact(text: Optional[str]) -> str:
+    """Collapse whitespace and drop blank and repeated lines"""
+    lines, seen = [], set()
+    for line in (text or "").splitlines():
+        line = re.sub(r"\s+", " ", line).strip()
+        if line and line.casefold() not in seen:
+            seen.add(line.casefold())
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _prefix(text: str, budget: int) -> str:
+    encoding = _tiktoken_encoding()
+    if encoding:
+        return encoding.decode(encoding.encode(text)[:budget])
+    return text[:budget * CHARS_PER_TOKEN]
+
+
+def _suffix(text: str, budget: int) -> str:
+    if budget <= 0:
+        return ""
+    encoding = _tiktoken_encoding()
+    if encoding:
+        return encoding.decode(encoding.encode(text)[-budget:])
+    return text[-budget * CHARS_PER_TOKEN:]
+
+
+def truncate(text: str, budget: int) -> str:
+    """Cut text to about budget tokens, keeping two thirds from the head and the rest from the tail"""
+    if count_tokens(text) <= budget:
+        return text
+    head = budget * 2 // 3
+    tail = budget - head - count_tokens(ELISION)
+    return f"{_prefix(text, head).rstrip()} {ELISION} {_suffix(text, tail).lstrip()}".strip()
+
+
+class PromptStats:
+    def __init__(self):
+        self.prompts = 0
+        self.tokens = 0
+        self.max_tokens = 0
+        self.compacted_tokens = 0
+        self.truncated = 0
+
+    def record(self, tokens: int, original_tokens: int, truncated: bool) -> None:
+        self.prompts += 1
+        self.tokens += tokens
+        self.max_tokens = max(self.max_tokens, tokens)
+        self.compacted_tokens += max(0, original_tokens - tokens)
+        self.truncated += int(truncated)
+
+    def stats(self) -> dict:
+        return {
+            "tokenizer": "tiktoken" if _tiktoken_encoding() else "estimate",
+            "prompts": self.prompts,
+            "tokens": self.tokens,
+            "avg_tokens": round(self.tokens / self.prompts, 1) if self.prompts else 0.0,
+            "max_tokens": self.max_tokens,
+            "tokens_saved": self.compacted_tokens,
+            "truncated": self.truncated,
+        }
+
+
+prompt_stats = PromptStats()
+
+
+class RequestTokens:
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.prompts = 0
+
+
+_request_tokens: ContextVar[Optional[RequestTokens]] = ContextVar("request_tokens", default=None)
+
+
+def record_completion_tokens(tokens: int) -> None:
+    """Charge provider-reported completion tokens to the current request, if any"""
+    usage = _request_tokens.get()
+    if usage is not None:
+        usage.completion_tokens += tokens
+
+
+class TokenUsageMiddleware:
+    """Reports the prompt and completion tokens each HTTP request spent"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        usage = RequestTokens()
+        token = _request_tokens.set(usage)
+
+        async def send_with_usage(message):
+            if message["type"] == "http.response.start" and usage.prompts:
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"x-prompt-tokens", str(usage.prompt_tokens).encode()),
+                    (b"x-completion-tokens", str(usage.completion_tokens).encode()),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_usage)
+        finally:
+            _request_tokens.reset(token)
+            if usage.prompts:
+                print(f"🔢 {scope['method']} {scope['path']}: {usage.prompts} prompts, "
+                      f"{usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens")
+
+
+class PromptBuilder:
+    """Chat messages from a fixed system prefix and budgeted request sections"""
+
+    def __init__(self, system: str):
+        self.system = system
+        self._sections: List[str] = []
+        self._original_tokens = 0
+        self.truncated = False
+        self.tokens = 0
+
+    def add(self, text: str) -> "PromptBuilder":
+        """A section used verbatim (short, request-specific lines)"""
+        self._original_tokens += count_tokens(text)
+        self._sections.append(text)
+        return self
+
+    def add_text(self, label: str, text: Optional[str], budget: int, default: str = "Not provided") -> "PromptBuilder":
+        """A free-text section, compacted and cut to budget tokens"""
+        self._original_tokens += count_tokens(text or default)
+        value = compact(text)
+        fitted = truncate(value, budget) if value else default
+        self.truncated |= fitted != (value or default)
+        self._sections.append(f"{label}:\n{fitted}")
+        return self
+
+    def messages(self) -> List[dict]:
+        user = "\n\n".join(self._sections)
+        self.tokens = count_tokens(self.system) + count_tokens(user) + 2 * MESSAGE_TOKENS
+        prompt_stats.record(self.tokens, self._original_tokens + count_tokens(self.system) + 2 * MESSAGE_TOKENS,
+                            self.truncated)
+        usage = _request_tokens.get()
+        if usage is not None:
+            usage.prompts += 1
+            usage.prompt_tokens += self.tokens
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": user},
+        ]
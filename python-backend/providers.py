@@ -0,0 +1,365 @@
+"""
+Routing of chat completions across OpenAI-compatible providers
+
+Each provider (OpenAI, Groq, a local stub, ...) has its own pooled LLMClient, a
+circuit breaker and rolling latency/error statistics. A completion goes to the
+first provider whose breaker is closed; if it has not answered after the
+hedge delay (its recent p95 by default) the next provider is started as well
+and the first success wins. Failures move on to the next provider at once,
+and providers whose typical latency no longer fits in the remaining deadline
+are skipped, so callers fall back to canned questions instead of waiting.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+from config import settings
+from llm import LLMClient
+
+
+class ProvidersUnavailable(Exception):
+    """No provider produced a completion before the deadline"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one probe through after reset_timeout"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        # Open (or a half-open probe that never reported back): probe again after the timeout
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class RollingStats:
+    """Latency percentiles and error rate over the last `window` calls"""
+
+    def __init__(self, window: int = 100):
+        self._calls = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self._calls.append((seconds, ok))
+
+    def percentile(self, q: float) -> Optional[float]:
+        latencies = sorted(seconds for seconds, ok in self._calls if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+
+    @property
+    def samples(self) -> int:
+        return len(self._calls)
+
+    @property
+    def successes(self) -> int:
+        return sum(1 for _, ok in self._calls if ok)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok in self._calls if not ok) / len(self._calls)
+
+
+class Provider:
+    def __init__(self, name: str, client: LLMClient, breaker: CircuitBreaker, stats: RollingStats):
+        self.name = name
+        self.client = client
+        self.breaker = breaker
+        self.stats = stats
+
+    @property
+    def model(self) -> str:
+        return self.client.model
+
+    def fits(self, remaining: float) -> bool:
+        """Whether a typical (p50) call still finishes within the remaining deadline"""
+        p50 = self.stats.percentile(0.5)
+        return remaining > 0 and (p50 is None or p50 < remaining)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.stats.record(seconds, ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def describe(self) -> dict:
+        p50, p95 = self.stats.percentile(0.5), self.stats.percentile(0.95)
+        return {
+            "model": self.model,
+            "breaker": self.breaker.state,
+            "samples": self.stats.samples,
+            "error_rate": round(self.stats.error_rate, 4),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "client": self.client.stats(),
+        }
+
+
+class ProviderRouter:
+    def __init__(
+        self,
+        providers: List[Provider],
+        deadline: float = 20.0,
+        hedging: bool = True,
+        hedge_delay: Optional[float] = None,
+        hedge_min_delay: float = 0.5,
+        hedge_initial_delay: float = 2.0,
+        hedge_min_samples: int = 20,
+    ):
+        self.providers = providers
+        self.deadline = deadline
+        self.hedging = hedging
+        self.hedge_delay = hedge_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_initial_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.hedges = 0
+        self.failovers = 0
+        self.skipped = 0
+        self.exhausted = 0
+        self.wins: Dict[str, int] = {provider.name: 0 for provider in providers}
+
+    @property
+    def model(self) -> str:
+        """Identifies the configured provider chain, e.g. for cache keys"""
+        return ",".join(f"{provider.name}:{provider.model}" for provider in self.providers)
+
+    def _hedge_after(self, provider: Provider) -> Optional[float]:
+        if not self.hedging:
+            return None
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if provider.stats.successes < self.hedge_min_samples:
+            # Not enough history for a p95 yet (cold start, or a provider that keeps failing)
+            return self.hedge_initial_delay
+        return max(provider.stats.percentile(0.95), self.hedge_min_delay)
+
+    async def _attempt(self, provider: Provider, timeout: float, messages, max_tokens, temperature) -> str:
+        start = time.monotonic()
+        try:
+            content = await asyncio.wait_for(
+                provider.client.complete(messages, max_tokens=max_tokens, temperature=temperature),
+                timeout,
+            )
+        except asyncio.CancelledError:
+            # Outrun or abandoned; complete() decides whether that counts against the provider
+            raise
+        except Exception:
+            provider.record(time.monotonic() - start, ok=False)
+            raise
+        provider.record(time.monotonic() - start, ok=True)
+        return content
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """First successful completion across providers, within the deadline (seconds)"""
+        expires_at = time.monotonic() + (deadline or self.deadline)
+        candidates = list(self.providers)
+        pending: Dict[asyncio.Task, Provider] = {}
+        started_at: Dict[asyncio.Task, float] = {}
+        overdue_at: Dict[asyncio.Task, float] = {}
+        errors = []
+        settled = False
+
+        def launch() -> Optional[Provider]:
+            while candidates:
+                provider = candidates.pop(0)
+                remaining = expires_at - time.monotonic()
+                if not provider.breaker.allow():
+                    continue
+                if provider.fits(remaining):
+                    task = asyncio.ensure_future(
+                        self._attempt(provider, remaining, messages, max_tokens, temperature)
+                    )
+                    pending[task] = provider
+                    started_at[task] = time.monotonic()
+                    overdue_at[task] = started_at[task] + (self._hedge_after(provider) or 0.0)
+                    return provider
+                self.skipped += 1
+            return None
+
+        latest = launch()
+        try:
+            while pending:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    settled = True
+                    break
+                hedge_after = self._hedge_after(latest) if candidates else None
+                timeout = min(remaining, hedge_after) if hedge_after is not None else remaining
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if hedge_after is not None and time.monotonic() < expires_at:
+                        started = launch()
+                        if started is not None:
+                            self.hedges += 1
+                            latest = started
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        self.wins[provider.name] += 1
+                        settled = True
+                        return task.result()
+                    error = task.exception()
+                    errors.append(f"{provider.name}: {str(error) or type(error).__name__}")
+                if not pending:
+                    started = launch()
+                    if started is not None:
+                        self.failovers += 1
+                        latest = started
+        finally:
+            now = time.monotonic()
+            for task, provider in pending.items():
+                if task.done():
+                    # Finished in the same wait() round as the winner; _attempt recorded its outcome
+                    continue
+                task.cancel()
+                if settled and now >= overdue_at[task]:
+                    # Outrun after its hedge delay, or still running at the deadline: a slow call
+                    # counts against the breaker (not when our own caller went away)
+                    provider.record(now - started_at[task], ok=False)
+
+        self.exhausted += 1
+        raise ProvidersUnavailable("; ".join(errors) or "no provider available before the deadline")
+
+    async def stream(
+        self,
+        messages: List[dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Streamed completion from the first provider that starts answering.
+
+        Streams are not hedged; a provider that fails before its first delta is
+        replaced by the next one, a failure after that is raised to the caller.
+        """
+        errors = []
+        for provider in self.providers:
+            if not provider.breaker.allow():
+                continue
+            start = time.monotonic()
+            started = False
+            try:
+                async for delta in provider.client.stream(messages, max_tokens=max_tokens, temperature=temperature):
+                    started = True
+                    yield delta
+            except Exception as e:
+                provider.record(time.monotonic() - start, ok=False)
+                if started:
+                    raise
+                errors.append(f"{provider.name}: {e}")
+                self.failovers += 1
+                continue
+            provider.record(time.monotonic() - start, ok=True)
+            self.wins[provider.name] += 1
+            return
+        self.exhausted += 1
+        raise ProvidersUnavailable("; ".join(errors) or "no provider available")
+
+    def stats(self) -> dict:
+        return {
+            "providers": {provider.name: provider.describe() for provider in self.providers},
+            "wins": self.wins,
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "skipped_for_deadline": self.skipped,
+            "exhausted": self.exhausted,
+        }
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.client.aclose()
+
+
+# name -> (api key, base url, model); providers without credentials are left out
+def _provider_settings() -> Dict[str, tuple]:
+    return {
+        "openai": (settings.openai_api_key, settings.openai_base_url, settings.llm_model),
+        "groq": (settings.groq_api_key, settings.groq_base_url, settings.groq_model),
+        "local": ("local" if settings.local_llm_base_url else "", settings.local_llm_base_url, settings.local_llm_model),
+    }
+
+
+def create_provider_router() -> ProviderRouter:
+    configured = _provider_settings()
+    providers = []
+    for name in [name.strip() for name in settings.llm_providers.split(",") if name.strip()]:
+        if name not in configured:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        api_key, base_url, model = configured[name]
+        if not api_key:
+            continue
+        client = LLMClient(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            timeout=settings.llm_timeout,
+            connect_timeout=settings.llm_connect_timeout,
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+        )
+        providers.append(Provider(
+            name,
+            client,
+            CircuitBreaker(settings.llm_breaker_failure_threshold, settings.llm_breaker_reset_timeout),
+            RollingStats(settings.llm_stats_window),
+        ))
+    return ProviderRouter(
+        providers,
+        deadline=settings.llm_deadline,
+        hedging=settings.llm_hedging,
+        hedge_delay=settings.llm_hedge_delay,
+        hedge_min_delay=settings.llm_hedge_min_delay,
+        hedge_initial_delay=settings.llm_hedge_initial_delay,
+    )
+
+
+_router: Optional[ProviderRouter] = None
+
+
+def get_provider_router() -> ProviderRouter:
+    """The shared router; created on first use when the app lifespan did not run"""
+    global _router
+    if _router is None:
+        _router = create_provider_router()
+    return _router
+
+
+async def close_provider_router() -> None:
+    global _router
+    if _router is not None:
+        await _router.aclose()
+        _router = None
@@ -0,0 +1,208 @@
+"""
+Question bank: reuse previously generated questions for similar roles
+
+Every successful generation is stored in the question_bank table. A TF-IDF
+index over job title (weighted double) and description is kept in memory as a
+row-normalized scipy CSR matrix, so a lookup is one sparse dot product. When the
+best match for the same interview type and difficulty (with enough questions)
+reaches QUESTION_BANK_THRESHOLD cosine similarity, its questions are served
+instead of calling the LLM.
+
+New entries are searchable after the next rebuild, which happens lazily at most
+once every QUESTION_BANK_REBUILD_INTERVAL seconds.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+
+from config import settings
+from database import AsyncSessionLocal
+from models import QuestionBankEntry, parse_json_value
+from question_cache import question_cache_key
+from schemas import QuestionRequest
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+TITLE_WEIGHT = 2
+
+
+def tokenize(job_title: Optional[str], description: Optional[str]) -> List[str]:
+    title = TOKEN_RE.findall((job_title or "").lower())
+    return title * TITLE_WEIGHT + TOKEN_RE.findall((description or "").lower())
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+class TfidfIndex:
+    """Sublinear TF-IDF vectors, L2-normalized, one CSR row per document"""
+
+    def __init__(self, documents: Sequence[List[str]]):
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+        for row, tokens in enumerate(documents):
+            for token, count in Counter(tokens).items():
+                col = self.vocabulary.setdefault(token, len(self.vocabulary))
+                rows.append(row)
+                cols.append(col)
+                values.append(1.0 + math.log(count))
+        shape = (len(documents), len(self.vocabulary))
+        matrix = sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=np.float32)
+
+        document_frequency = np.bincount(cols, minlength=shape[1]) if cols else np.zeros(0)
+        self.idf = (np.log((1.0 + shape[0]) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self.matrix = sparse.diags(1.0 / norms).dot(matrix).tocsr()
+        # Column-major copy: a query only touches the columns of its own terms
+        self._columns = self.matrix.tocsc()
+
+    def scores(self, tokens: List[str]) -> np.ndarray:
+        """Cosine similarity of a query against every document"""
+        counts = Counter(token for token in tokens if token in self.vocabulary)
+        if not counts:
+            return np.zeros(self.matrix.shape[0], dtype=np.float32)
+        cols = np.fromiter((self.vocabulary[token] for token in counts), dtype=np.int64)
+        weights = np.fromiter((1.0 + math.log(count) for count in counts.values()), dtype=np.float32)
+        weights *= self.idf[cols]
+        weights /= np.linalg.norm(weights)
+        return self._columns[:, cols].dot(weights)
+
+
+class QuestionBank:
+    def __init__(self, threshold: float, rebuild_interval: float):
+        self.threshold = threshold
+        self.rebuild_interval = rebuild_interval
+        self.hits = 0
+        self.misses = 0
+        self.build_ms = 0.0
+        self._entries: List[dict] = []
+        self._keys: Dict[str, int] = {}
+        # (index, rows per (interview type, difficulty), question counts), swapped in as one unit
+        self._snapshot = None
+        self._indexed = 0
+        self._built_at = 0.0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def _add_entry(self, entry: dict) -> None:
+        position = self._keys.get(entry["key"])
+        if position is None:
+            self._keys[entry["key"]] = len(self._entries)
+            self._entries.append(entry)
+        else:
+            self._entries[position] = entry
+
+    def rebuild(self) -> None:
+        start = time.perf_counter()
+        entries = list(self._entries)
+        groups: Dict[tuple, List[int]] = {}
+        for row, entry in enumerate(entries):
+            groups.setdefault((entry["interview_type"], entry["difficulty"]), []).append(row)
+        self._snapshot = (
+            TfidfIndex([entry["tokens"] for entry in entries]),
+            {group: np.array(rows, dtype=np.int64) for group, rows in groups.items()},
+            np.array([len(entry["questions"]) for entry in entries], dtype=np.int64),
+        )
+        self._indexed = len(entries)
+        self._built_at = time.monotonic()
+        self.build_ms = (time.perf_counter() - start) * 1000
+
+    async def load(self) -> None:
+        """Read the bank table and build the index (once per process)"""
+        async with self._lock:
+            if self._loaded:
+                return
+            async with AsyncSessionLocal() as db:
+                result = await db.stream(select(QuestionBankEntry).execution_options(yield_per=1000))
+                async for row in result.scalars():
+                    self._add_entry(self._entry(row.request_key, row.job_title, row.description,
+                                                row.interview_type, row.difficulty_level,
+                                                parse_json_value(row.questions)))
+            await asyncio.to_thread(self.rebuild)
+            self._loaded = True
+
+    @staticmethod
+    def _entry(key, job_title, description, interview_type, difficulty, questions) -> dict:
+        return {
+            "key": key,
+            "tokens": tokenize(job_title, description),
+            "interview_type": _normalize(interview_type),
+            "difficulty": _normalize(difficulty),
+            "questions": questions if isinstance(questions, list) else [],
+        }
+
+    def match(self, request: QuestionRequest) -> Optional[List[dict]]:
+        """Questions of the most similar entry above the threshold, if any"""
+        if not self._indexed:
+            return None
+        index, groups, counts = self._snapshot
+        rows = groups.get((_normalize(request.interview_type), _normalize(request.difficulty_level)))
+        if rows is None:
+            return None
+        rows = rows[counts[rows] >= request.num_questions]
+        if not len(rows):
+            return None
+        scores = index.scores(tokenize(request.job_title, request.job_description))[rows]
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._entries[rows[best]]["questions"][:request.num_questions]
+
+    async def lookup(self, request: QuestionRequest) -> Optional[List[dict]]:
+        await self.load()
+        if len(self._entries) != self._indexed and time.monotonic() - self._built_at >= self.rebuild_interval:
+            async with self._lock:
+                if len(self._entries) != self._indexed:
+                    await asyncio.to_thread(self.rebuild)
+        questions = self.match(request)
+        if questions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return questions
+
+    async def add(self, request: QuestionRequest, questions: List[dict]) -> None:
+        """Store generated questions; searchable after the next rebuild"""
+        key = question_cache_key(request, "bank")
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(QuestionBankEntry).where(QuestionBankEntry.request_key == key))
+            row = result.scalars().first()
+            if row is None:
+                db.add(QuestionBankEntry(
+                    request_key=key,
+                    job_title=request.job_title,
+                    description=request.job_description,
+                    interview_type=request.interview_type,
+                    difficulty_level=request.difficulty_level,
+                    questions=questions,
+                ))
+            else:
+                row.questions = questions
+            await db.commit()
+        self._add_entry(self._entry(key, request.job_title, request.job_description,
+                                    request.interview_type, request.difficulty_level, questions))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "indexed": self._indexed,
+            "vocabulary": len(self._snapshot[0].vocabulary) if self._snapshot is not None else 0,
+            "build_ms": round(self.build_ms, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+question_bank = QuestionBank(settings.question_bank_threshold, settings.question_bank_rebuild_interval)
@@ -0,0 +1,157 @@
+"""
+Content-addressed cache for generated interview questions
+
+Requests that normalize to the same job title, description, interview type,
+difficulty, question count and model share one cached question list. Entries
+live in the response cache backend (LRU+TTL in memory by default) and, when
+QUESTION_CACHE_PATH is set, in a small SQLite file so they survive restarts.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from typing import List, Optional
+
+from cache import create_cache
+from config import settings
+from schemas import QuestionRequest
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def question_cache_key(request: QuestionRequest, model: str) -> str:
+    """Stable key for a question request; the description only contributes its hash"""
+    description_hash = hashlib.sha256(_normalize(request.job_description).encode()).hexdigest()
+    parts = [
+        _normalize(request.job_title),
+        description_hash,
+        _normalize(request.interview_type),
+        _normalize(request.difficulty_level),
+        str(request.num_questions),
+        model,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class DiskStore:
+    """SQLite-backed key/value file holding cached question lists between restarts"""
+
+    def __init__(self, path: str, ttl: float, maxsize: int):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM question_cache WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT value FROM question_cache WHERE key = ? AND expires_at >= ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE question_cache SET used_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return row[0]
+
+    def _set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO question_cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, value, now + self.ttl, now),
+        )
+        # Least recently used entries beyond maxsize are dropped
+        self._conn.execute(
+            "DELETE FROM question_cache WHERE key NOT IN "
+            "(SELECT key FROM question_cache ORDER BY used_at DESC LIMIT ?)",
+            (self.maxsize,),
+        )
+        self._conn.commit()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        async with self._lock:
+            return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._set, key, value)
+
+    def size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class QuestionCache:
+    """Question lists by request key, with hit-rate accounting"""
+
+    def __init__(self, maxsize: int, ttl: float, path: Optional[str] = None):
+        self.memory = create_cache("questions", maxsize, ttl)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self._disk: Optional[DiskStore] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @property
+    def disk(self) -> Optional[DiskStore]:
+        if self._disk is None and self.path:
+            self._disk = DiskStore(self.path, self.ttl, self.maxsize)
+        return self._disk
+
+    async def get(self, key: str) -> Optional[List[dict]]:
+        value = await self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = await self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                await self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, questions: List[dict]) -> None:
+        value = json.dumps(questions).encode()
+        await self.memory.set(key, value)
+        if self.disk is not None:
+            await self.disk.set(key, value)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.memory.stats()["backend"],
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "disk_entries": self._disk.size() if self._disk is not None else None,
+        }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+question_cache = QuestionCache(
+    settings.question_cache_maxsize,
+    settings.question_cache_ttl,
+    settings.question_cache_path,
+)
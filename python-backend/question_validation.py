@@ -0,0 +1,68 @@
+"""
+Validation and salvage of generated question lists
+
+Each element of the model output is checked against schemas.GeneratedQuestion
+on its own, so one malformed or truncated object no longer discards the whole
+response: valid items are kept (duplicates dropped) and only the missing count
+is requested again in a smaller top-up completion.
+"""
+
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from json_stream import JSONArrayStream
+from schemas import GeneratedQuestion
+
+# Completion budget per requested question (the original 5-question prompt used 1000)
+TOKENS_PER_QUESTION = 200
+
+
+class QuestionValidator:
+    def __init__(self):
+        self.completions = 0
+        self.partial = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.topups = 0
+        self.topup_questions = 0
+
+    def validate(self, item, seen: List[dict]) -> Optional[dict]:
+        """The normalized question, or None if it is invalid or repeats one in seen"""
+        try:
+            question = GeneratedQuestion.model_validate(item).model_dump()
+        except ValidationError:
+            self.rejected += 1
+            return None
+        text = question["question"].casefold()
+        if any(existing["question"].casefold() == text for existing in seen):
+            self.rejected += 1
+            return None
+        self.accepted += 1
+        return question
+
+    def salvage(self, content: str, seen: List[dict], limit: int) -> List[dict]:
+        """Valid questions from a completion, including the complete items of truncated output"""
+        self.completions += 1
+        parser = JSONArrayStream()
+        questions = []
+        for item in parser.feed(content):
+            question = self.validate(item, seen + questions)
+            if question is not None and len(questions) < limit:
+                questions.append(question)
+        if len(questions) < limit:
+            self.partial += 1
+        return questions
+
+    def stats(self) -> dict:
+        return {
+            "completions": self.completions,
+            "partial": self.partial,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "topups": self.topups,
+            "topup_questions": self.topup_questions,
+        }
+
+
+question_validator = QuestionValidator()
@@ -0,0 +1,194 @@
+"""
+Admission control for the AI endpoints
+
+Every AI request takes a token from the caller's bucket and from a global
+bucket (refilled continuously at AI_USER_RATE / AI_GLOBAL_RATE per second, up to
+the burst size), then waits for one of AI_MAX_CONCURRENCY slots. At most
+AI_MAX_QUEUE requests wait, each for up to AI_QUEUE_TIMEOUT seconds. Requests
+over a limit are shed with 429 and a Retry-After header instead of queueing on
+the shared provider quota.
+
+Buckets are keyed on the authenticated user. The cookie auth is still a mock
+that returns the same user for every caller, so routes behind it key their
+buckets on the caller's bearer identity when a valid token is sent, else on
+the client address (see admit_ai_request_by_client).
+
+State is per worker process: with several workers the effective limits are
+multiplied by the worker count.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Hashable, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError, jwt
+
+from config import settings
+from models import User
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Take one token; returns 0 on success, else the seconds until one is available"""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def refund(self) -> None:
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdmissionController:
+    def __init__(self, user_rate: float, user_burst: float, global_rate: float, global_burst: float,
+                 max_concurrency: int, max_queue: int, queue_timeout: float, max_users: int = 10000):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_users = max_users
+        self._global = TokenBucket(global_rate, global_burst)
+        self._users: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.user_limited = 0
+        self.global_limited = 0
+        self.queue_full = 0
+        self.queue_timeouts = 0
+
+    def _user_bucket(self, key: Hashable) -> TokenBucket:
+        bucket = self._users.get(key)
+        if bucket is None:
+            bucket = self._users[key] = TokenBucket(self.user_rate, self.user_burst)
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(key)
+        return bucket
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> HTTPException:
+        retry_after = 60 if math.isinf(retry_after) else max(1, math.ceil(retry_after))
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self, key: Optional[Hashable]) -> None:
+        """Admit a request from the caller identified by key or raise 429; call release() when it is done"""
+        user_bucket = self._user_bucket(key) if key is not None else None
+        if user_bucket is not None:
+            wait = user_bucket.take()
+            if wait:
+                self.user_limited += 1
+                raise self._reject("Too many AI requests, please slow down", wait)
+        wait = self._global.take()
+        if wait:
+            if user_bucket is not None:
+                user_bucket.refund()
+            self.global_limited += 1
+            raise self._reject("AI service is busy, try again shortly", wait)
+
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.queue_full += 1
+            raise self._reject("AI service is busy, try again shortly", self.queue_timeout)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            raise self._reject("AI service is busy, try again shortly", self.queue_timeout)
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "user_limited": self.user_limited,
+            "global_limited": self.global_limited,
+            "queue_full": self.queue_full,
+            "queue_timeouts": self.queue_timeouts,
+            "tracked_users": len(self._users),
+        }
+
+
+ai_admission = AdmissionController(
+    user_rate=settings.ai_user_rate,
+    user_burst=settings.ai_user_burst,
+    global_rate=settings.ai_global_rate,
+    global_burst=settings.ai_global_burst,
+    max_concurrency=settings.ai_max_concurrency,
+    max_queue=settings.ai_max_queue,
+    queue_timeout=settings.ai_queue_timeout,
+)
+
+
+@asynccontextmanager
+async def _admitted(key: Hashable):
+    if not settings.ai_rate_limit_enabled:
+        yield
+        return
+    await ai_admission.acquire(key)
+    try:
+        yield
+    finally:
+        ai_admission.release()
+
+
+def admit_ai_request(user_dependency: Callable):
+    """Route dependency that holds an admission slot for the whole request"""
+
+    async def dependency(current_user: User = Depends(user_dependency)):
+        async with _admitted(current_user.id):
+            yield
+
+    return dependency
+
+
+def client_key(request: Request) -> str:
+    """The caller's bearer identity if it sends a valid token, else its address"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"sub:{subject}"
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
+async def admit_ai_request_by_client(request: Request):
+    """admit_ai_request for routes behind the mock cookie auth, keyed on client_key"""
+    async with _admitted(client_key(request)):
+        yield
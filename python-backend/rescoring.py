@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Recompute stored feedback from saved transcripts with the current scoring rules
+
+Transcripts are read in keyset-ordered chunks, scored in parallel on a process
+pool (one worker per core by default) and written back with one bulk UPDATE
+per chunk. After every committed chunk the last interview id is saved to the
+state file, so an interrupted run continues where it stopped with --resume.
+--dry-run scores everything and reports how many scores would change without
+writing anything. Servers may keep serving the old feedback from their
+interview cache for up to INTERVIEW_CACHE_TTL seconds after a CLI run; runs
+started from the admin endpoint invalidate it.
+
+Usage:
+    python rescoring.py [--batch-size 500] [--workers N] [--dry-run] [--resume] [--state-file rescoring_state.json]
+
+The same run can be started from POST /api/admin/rescore.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+
+from database import SessionLocal
+from models import Interview, InterviewTranscript, parse_json_value
+from scoring import feedback_scorer
+
+DEFAULT_STATE_FILE = "rescoring_state.json"
+
+
+def score_chunk(rows: List[Tuple[int, Optional[str], Optional[str], bytes, str]]) -> List[Tuple[int, dict]]:
+    """Feedback for (interview id, job title, interview type, payload, codec) rows; runs in a pool worker"""
+    from scoring import build_feedback
+    from transcripts import iter_turns
+
+    return [(interview_id, build_feedback(list(iter_turns(payload, codec)), job_title, interview_type))
+            for interview_id, job_title, interview_type, payload, codec in rows]
+
+
+class Rescorer:
+    def __init__(self, batch_size: int = 500, workers: Optional[int] = None, dry_run: bool = False,
+                 state_file: Optional[str] = DEFAULT_STATE_FILE,
+                 progress: Optional[Callable[[dict], None]] = None,
+                 on_write: Optional[Callable[[List[Tuple[Optional[int], int]]], None]] = None):
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.dry_run = dry_run
+        self.state_file = state_file
+        self.progress = progress
+        self.on_write = on_write
+        self.total = 0
+        self.processed = 0
+        self.changed = 0
+        self.last_id = 0
+        self.started_at: Optional[float] = None
+        self.finished = False
+
+    def load_state(self) -> None:
+        """Continue after the last committed chunk of an earlier run with the same scoring version"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        with open(self.state_file) as f:
+            state = json.load(f)
+        if state.get("scoring_version") == feedback_scorer.version:
+            self.last_id = state.get("last_id", 0)
+
+    def _save_state(self) -> None:
+        if self.state_file and not self.dry_run:
+            with open(self.state_file, "w") as f:
+                json.dump({"last_id": self.last_id, "scoring_version": feedback_scorer.version}, f)
+
+    def _chunks(self, db):
+        """Transcript rows in id order, batch_size at a time, starting after last_id"""
+        last_id = self.last_id
+        while True:
+            rows = db.execute(
+                select(InterviewTranscript.interview_id, Interview.user_id, Interview.job_title,
+                       Interview.interview_type, InterviewTranscript.payload, InterviewTranscript.codec,
+                       Interview.feedback)
+                .join(Interview, Interview.id == InterviewTranscript.interview_id)
+                .where(InterviewTranscript.interview_id > last_id)
+                .order_by(InterviewTranscript.interview_id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                return
+            last_id = rows[-1].interview_id
+            yield rows
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        rate = self.processed / elapsed if elapsed else 0.0
+        remaining = self.total - self.processed
+        return {
+            "dry_run": self.dry_run,
+            "workers": self.workers,
+            "total": self.total,
+            "processed": self.processed,
+            "changed": self.changed,
+            "last_id": self.last_id,
+            "rate": round(rate, 1),
+            "eta_seconds": round(remaining / rate, 1) if rate and not self.finished else None,
+            "finished": self.finished,
+            "scoring_version": feedback_scorer.version,
+        }
+
+    def _write(self, db, results: List[Tuple[int, dict]], previous: dict, owners: dict) -> None:
+        changed = [(interview_id, feedback) for interview_id, feedback in results
+                   if feedback != previous.get(interview_id)]
+        self.changed += len(changed)
+        if changed and not self.dry_run:
+            now = datetime.now(timezone.utc)
+            db.execute(update(Interview), [
+                {"id": interview_id, "feedback": feedback, "updated_at": now}
+                for interview_id, feedback in changed
+            ])
+            db.commit()
+            if self.on_write is not None:
+                self.on_write([(owners[interview_id], interview_id) for interview_id, _ in changed])
+
+    def run(self) -> dict:
+        self.started_at = time.monotonic()
+        db = SessionLocal()
+        try:
+            self.total = db.execute(
+                select(func.count()).select_from(InterviewTranscript)
+                .where(InterviewTranscript.interview_id > self.last_id)
+            ).scalar_one()
+            with ProcessPoolExecutor(self.workers) as pool:
+                pending = []
+                for rows in self._chunks(db):
+                    previous = {row.interview_id: parse_json_value(row.feedback) for row in rows}
+                    owners = {row.interview_id: row.user_id for row in rows}
+                    # Transcripts stay compressed until they reach the workers
+                    payload = [(row.interview_id, row.job_title, row.interview_type, row.payload, row.codec)
+                               for row in rows]
+                    # Split the chunk so every worker gets a share
+                    size = max(1, -(-len(payload) // self.workers))
+                    futures = [pool.submit(score_chunk, payload[i:i + size]) for i in range(0, len(payload), size)]
+                    pending.append((rows[-1].interview_id, previous, owners, futures))
+                    # Keep one chunk scoring while the previous one is written
+                    if len(pending) > 1:
+                        self._finish(db, *pending.pop(0))
+                for chunk in pending:
+                    self._finish(db, *chunk)
+        finally:
+            db.close()
+        self.finished = True
+        # A completed run leaves nothing to resume
+        if self.state_file and not self.dry_run and os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        return self.stats()
+
+    def _finish(self, db, last_id: int, previous: dict, owners: dict, futures) -> None:
+        results = [item for future in futures for item in future.result()]
+        self._write(db, results, previous, owners)
+        self.processed += len(results)
+        self.last_id = last_id
+        self._save_state()
+        if self.progress is not None:
+            self.progress(self.stats())
+
+
+def _print_progress(stats: dict) -> None:
+    eta = f", ETA {stats['eta_seconds']:.0f}s" if stats["eta_seconds"] is not None else ""
+    print(f"  {stats['processed']}/{stats['total']} interviews, {stats['changed']} changed "
+          f"({stats['rate']:.0f}/s{eta}), up to id {stats['last_id']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Score and report changes without writing")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last chunk saved in the state file")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE)
+    args = parser.parse_args()
+
+    rescorer = Rescorer(args.batch_size, args.workers, args.dry_run, args.state_file, _print_progress)
+    if args.resume:
+        rescorer.load_state()
+    mode = "Dry run" if args.dry_run else "Re-scoring"
+    print(f"{mode}: scoring version {feedback_scorer.version}, {rescorer.workers} workers, starting after id {rescorer.last_id}")
+    stats = rescorer.run()
+    verb = "would change" if args.dry_run else "updated"
+    print(f"✅ {stats['processed']} interviews scored, {stats['changed']} {verb}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from auth import get_current_admin
+from cache import interview_cache, interview_cache_key
+from models import User
+from rescoring import Rescorer
+import asyncio
+
+router = APIRouter()
+
+# The re-scoring run of this worker process (at most one at a time)
+_rescore = {"rescorer": None, "task": None, "error": None}
+
+def _rescore_status() -> dict:
+    rescorer, task = _rescore["rescorer"], _rescore["task"]
+    if rescorer is None:
+        return {"running": False}
+    return {
+        "running": task is not None and not task.done(),
+        "error": _rescore["error"],
+        **rescorer.stats(),
+    }
+
+async def _run_rescore(rescorer: Rescorer) -> None:
+    try:
+        await asyncio.to_thread(rescorer.run)
+    except Exception as e:
+        print(f"❌ Re-scoring failed: {e}")
+        _rescore["error"] = str(e)
+
+@router.post("/rescore", status_code=status.HTTP_202_ACCEPTED)
+async def start_rescore(
+    dry_run: bool = False,
+    resume: bool = False,
+    batch_size: int = Query(500, ge=1, le=5000),
+    workers: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_admin)
+):
+    """Recompute stored feedback from saved transcripts in the background (see rescoring.py)
+
+    Poll GET /rescore for progress. With resume=true the run continues after
+    the last chunk committed by an interrupted run.
+    """
+    if _rescore["task"] is not None and not _rescore["task"].done():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A re-scoring run is already in progress")
+    
+    loop = asyncio.get_running_loop()
+    
+    def invalidate(keys):
+        # Called from the scoring thread after each committed chunk
+        for user_id, interview_id in keys:
+            asyncio.run_coroutine_threadsafe(interview_cache.delete(interview_cache_key(user_id, interview_id)), loop)
+    
+    rescorer = Rescorer(batch_size, workers, dry_run, on_write=invalidate)
+    if resume:
+        rescorer.load_state()
+    _rescore.update(rescorer=rescorer, error=None, task=asyncio.create_task(_run_rescore(rescorer)))
+    return _rescore_status()
+
+@router.get("/rescore")
+async def get_rescore_status(current_user: User = Depends(get_current_admin)):
+    """Progress of the current or last re-scoring run"""
+    return _rescore_status()
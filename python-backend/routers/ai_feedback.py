@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_db
-from models import User, Interview
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import User, Interview, parse_json_value
 from schemas import FeedbackRequest, FeedbackResponse
-from auth import get_current_user, get_current_user_from_cookie
+from auth import get_interview_owner
+from cache import interview_cache, interview_cache_key
+from scoring import build_feedback, is_current, transcript_hash
+from transcripts import save_transcript
 import openai
 import json
 from config import settings
@@ -15,16 +19,22 @@ router = APIRouter()
 @router.post("/feedback", response_model=FeedbackResponse)
 async def generate_feedback(
     request: FeedbackRequest,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    refresh: bool = False,
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate AI-powered interview feedback"""
+    """Generate AI-powered interview feedback
+
+    Feedback already computed from the same conversation with the current
+    scoring is returned as stored; pass ?refresh=true to recompute it.
+    """
     try:
         # Get the interview
-        interview = db.query(Interview).filter(
+        result = await db.execute(select(Interview).where(
             Interview.id == request.interviewId,
             Interview.user_id == current_user.id
-        ).first()
+        ))
+        interview = result.scalars().first()
         
         if not interview:
             raise HTTPException(
@@ -33,164 +43,30 @@ async def generate_feedback(
             )
         
         # Prepare conversation data for analysis
-        conversation_text = ""
         conversation_data = request.conversation
-        
-        for i, conv in enumerate(conversation_data):
-            if isinstance(conv, dict):
-                if 'role' in conv and 'content' in conv:
-                    # Handle role-based conversation format
-                    role = "Interviewer" if conv['role'] == 'assistant' else "Candidate"
-                    conversation_text += f"{role}: {conv['content']}\n"
-                else:
-                    # Handle question-answer format
-                    conversation_text += f"Q{i+1}: {conv.get('question', '')}\n"
-                    conversation_text += f"A{i+1}: {conv.get('answer', '')}\n\n"
-            else:
-                conversation_text += f"Exchange {i+1}: {str(conv)}\n"
-        
-        # Create detailed prompt for feedback generation with dynamic scoring
-        prompt = f"""
-        You are an expert HR professional analyzing an interview for a {interview.job_title} position.
-        
-        INTERVIEW DETAILS:
-        - Position: {interview.job_title}
-        - Interview Type: {interview.interview_type}
-        - Job Description: {interview.description or 'Not provided'}
-        - Total conversation exchanges: {len(conversation_data)}
-        
-        CONVERSATION ANALYSIS:
-        {conversation_text}
-        
-        EVALUATION CRITERIA:
-        Rate each skill on a scale of 1-10 based on the candidate's ACTUAL responses:
-        
-        1. TECHNICAL SKILLS (1-10):
-           - Assess depth of technical knowledge shown in responses
-           - Evaluate problem-solving approach demonstrated
-           - Consider relevant experience mentioned
-           - Look for specific technical examples given
-           
-        2. COMMUNICATION (1-10):
-           - Clarity of explanations provided
-           - Ability to articulate thoughts clearly
-           - Listening and responding appropriately
-           - Professional communication style
-           
-        3. PROBLEM SOLVING (1-10):
-           - Approach to hypothetical scenarios
-           - Logical thinking process shown
-           - Creativity in solutions offered
-           - Handling of challenging questions
-           
-        4. EXPERIENCE (1-10):
-           - Relevant past experience mentioned
-           - Depth of knowledge in field demonstrated
-           - Practical examples provided
-           - Understanding of industry trends shown
-        
-        SCORING GUIDELINES:
-        - 9-10: Exceptional performance, exceeds expectations
-        - 7-8: Good performance, meets most expectations  
-        - 5-6: Average performance, meets basic requirements
-        - 3-4: Below average, some concerns
-        - 1-2: Poor performance, significant concerns
-        
-        IMPORTANT: Base scores on ACTUAL conversation content, not generic responses.
-        Analyze what the candidate actually said and how they responded.
-        
-        Return JSON format:
-        {{
-            "ratings": {{
-                "technicalSkills": <1-10 based on actual technical responses>,
-                "communication": <1-10 based on actual communication quality>,
-                "problemSolving": <1-10 based on actual problem-solving shown>,
-                "experience": <1-10 based on actual experience demonstrated>
-            }},
-            "overallScore": <calculated average of the 4 ratings>,
-            "feedback": "<detailed analysis of actual performance based on conversation>",
-            "summary": ["<key point 1 from actual responses>", "<key point 2>", "<key point 3>"],
-            "strengths": ["<specific strength 1 from actual responses>", "<specific strength 2>"],
-            "areas_for_improvement": ["<specific area 1 from actual responses>", "<specific area 2>"],
-            "recommendation": "<Yes/No based on actual performance>",
-            "recommendationMsg": "<detailed explanation based on actual interview performance>"
-        }}
-        """
+        digest = transcript_hash(conversation_data)
+        stored = parse_json_value(interview.feedback)
+        if not refresh and is_current(stored, digest):
+            # Same conversation posted again: no recomputation, no write
+            return FeedbackResponse(
+                feedback=stored,
+                score=stored["overallScore"],
+                strengths=stored["strengths"],
+                areas_for_improvement=stored["areas_for_improvement"],
+                cached=True
+            )
         
         # Use fallback system since OpenAI quota is exceeded
         print("Using fallback feedback generation system...")
         
-        # Generate dynamic feedback based on conversation analysis
-        conversation_length = len(conversation_data)
-        conversation_text_lower = conversation_text.lower()
-        
-        # Analyze conversation content for scoring
-        technical_keywords = ['react', 'python', 'javascript', 'node', 'api', 'database', 'frontend', 'backend', 'coding', 'programming', 'development', 'framework', 'library', 'git', 'github']
-        communication_indicators = ['explain', 'describe', 'tell me', 'how', 'what', 'why', 'experience', 'project', 'team', 'work']
-        
-        # Count technical mentions
-        technical_mentions = sum(1 for keyword in technical_keywords if keyword in conversation_text_lower)
-        communication_quality = sum(1 for indicator in communication_indicators if indicator in conversation_text_lower)
-        
-        # Calculate dynamic scores
-        base_score = min(50 + (conversation_length * 3) + (technical_mentions * 2) + (communication_quality * 1), 90)
-        
-        # Generate detailed feedback based on actual conversation
-        feedback_analysis = f"Interview Analysis for {interview.job_title} Position:\n\n"
-        feedback_analysis += f"• Total conversation exchanges: {conversation_length}\n"
-        feedback_analysis += f"• Technical depth demonstrated: {'Good' if technical_mentions > 3 else 'Basic'}\n"
-        feedback_analysis += f"• Communication quality: {'Strong' if communication_quality > 5 else 'Adequate'}\n"
-        feedback_analysis += f"• Engagement level: {'High' if conversation_length > 5 else 'Moderate'}\n\n"
-        
-        # Generate strengths and areas for improvement based on actual conversation
-        strengths = []
-        areas_for_improvement = []
-        
-        if technical_mentions > 3:
-            strengths.append("Demonstrated good technical knowledge")
-        else:
-            areas_for_improvement.append("Could provide more technical examples")
-        
-        if communication_quality > 5:
-            strengths.append("Good communication skills")
-        else:
-            areas_for_improvement.append("Could improve communication clarity")
-        
-        if conversation_length > 5:
-            strengths.append("Engaged well in the interview")
-        else:
-            areas_for_improvement.append("Could provide more detailed responses")
-        
-        # Generate recommendation
-        recommendation = "Yes" if base_score > 65 else "No"
-        recommendation_msg = f"Based on the interview performance, the candidate is {'recommended' if base_score > 65 else 'not recommended'} for the next round. "
-        recommendation_msg += f"Overall engagement score: {base_score}/100"
-        
-        # Create comprehensive feedback
-        feedback_data = {
-            "ratings": {
-                "technicalSkills": max(4, min(9, (base_score + technical_mentions * 2) // 10)),
-                "communication": max(5, min(9, (base_score + communication_quality) // 10)),
-                "problemSolving": max(4, min(8, (base_score - 5) // 10)),
-                "experience": max(4, min(8, (base_score + technical_mentions) // 10))
-            },
-            "overallScore": base_score / 10,
-            "feedback": feedback_analysis,
-            "summary": [
-                f"Interview completed with {conversation_length} exchanges",
-                f"Technical knowledge: {'Strong' if technical_mentions > 3 else 'Basic'}",
-                f"Communication: {'Excellent' if communication_quality > 5 else 'Good'}",
-                f"Overall engagement: {base_score}/100"
-            ],
-            "strengths": strengths if strengths else ["Participated in interview", "Showed interest in position"],
-            "areas_for_improvement": areas_for_improvement if areas_for_improvement else ["Could provide more detailed examples"],
-            "recommendation": recommendation,
-            "recommendationMsg": recommendation_msg
-        }
+        # Keyword scoring over the transcript (see scoring.py)
+        feedback_data = build_feedback(conversation_data, interview.job_title, interview.interview_type, digest)
         
-        # Store feedback in database
-        interview.feedback = json.dumps(feedback_data)
-        db.commit()
+        # Store feedback in database, with the transcript for later re-scoring
+        interview.feedback = feedback_data
+        await save_transcript(db, interview.id, conversation_data)
+        await db.commit()
+        await interview_cache.delete(interview_cache_key(interview.user_id, interview.id))
         
         return FeedbackResponse(
             feedback=feedback_data,
@@ -208,14 +84,15 @@ async def generate_feedback(
 @router.get("/feedback/{interview_id}")
 async def get_interview_feedback(
     interview_id: int,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get feedback for a specific interview"""
-    interview = db.query(Interview).filter(
+    result = await db.execute(select(Interview).where(
         Interview.id == interview_id,
         Interview.user_id == current_user.id
-    ).first()
+    ))
+    interview = result.scalars().first()
     
     if not interview:
         raise HTTPException(
@@ -223,10 +100,11 @@ async def get_interview_feedback(
             detail="Interview not found"
         )
     
+    feedback = parse_json_value(interview.feedback)
     return {
         "interview_id": interview.id,
-        "feedback": interview.feedback,
-        "score": interview.score,
+        "feedback": feedback,
+        "score": (feedback or {}).get("overallScore"),
         "status": interview.status,
         "created_at": interview.created_at
     }
@@ -234,15 +112,16 @@ async def get_interview_feedback(
 @router.post("/feedback/analyze")
 async def analyze_interview_performance(
     interview_id: int,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze interview performance with detailed metrics"""
     try:
-        interview = db.query(Interview).filter(
+        result = await db.execute(select(Interview).where(
             Interview.id == interview_id,
             Interview.user_id == current_user.id
-        ).first()
+        ))
+        interview = result.scalars().first()
         
         if not interview:
             raise HTTPException(
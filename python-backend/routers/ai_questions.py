@@ -1,120 +1,172 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_db
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from database import get_async_db
 from models import User
 from schemas import QuestionRequest, QuestionResponse
 from auth import get_current_user
-import openai
-import json
+from providers import ProvidersUnavailable, get_provider_router
+from question_cache import question_cache, question_cache_key
+from singleflight import SingleFlight
+from json_stream import JSONArrayStream
+from question_bank import question_bank
+from question_validation import TOKENS_PER_QUESTION, question_validator
+from prompts import PromptBuilder
+from rate_limit import admit_ai_request
 from config import settings
+import json
 
 router = APIRouter()
 
-# OpenAI API key is now set per client instance
+# Completions go through the shared provider router (created in the app lifespan)
+
+# Coalesces concurrent generations for the same question cache key
+question_flight = SingleFlight("questions")
+
+class FallbackQuestions(list):
+    """Marks generic questions so callers can tell them from generated ones"""
+
+def fallback_questions(request: QuestionRequest) -> List[dict]:
+    """Generic questions used when no model is available"""
+    return FallbackQuestions([
+        {"text": f"What is your experience with {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
+        {"text": f"Describe a challenging project you worked on related to {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level},
+        {"text": f"How do you stay updated with the latest trends in {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
+        {"text": f"What tools and technologies do you use for {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
+        {"text": f"Tell me about a time you had to learn a new technology for {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level}
+    ])
+
+# Fixed instructions first: identical across requests, so providers can cache the prefix
+QUESTION_SYSTEM_PROMPT = """You are an expert HR professional and technical interviewer. Generate high-quality interview questions.
+
+Please generate questions that are:
+1. Relevant to the job title and description
+2. Appropriate for the interview type (technical, behavioral, experience-based)
+3. Matched to the requested difficulty level
+4. Professional and clear
+
+Return the questions as a JSON array with the following format:
+[
+    {
+        "question": "Question text here",
+        "type": "technical/behavioral/experience/problem solving/leadership",
+        "difficulty": "easy/medium/hard",
+        "expected_answer_length": "short/medium/long"
+    }
+]"""
+
+def question_prompt(request: QuestionRequest) -> PromptBuilder:
+    """Prompt for a question generation request, with the description cut to its token budget"""
+    return (
+        PromptBuilder(QUESTION_SYSTEM_PROMPT)
+        .add(f"Generate {request.num_questions} interview questions for a {request.job_title} position.\n"
+             f"Interview Type: {request.interview_type}\n"
+             f"Difficulty Level: {request.difficulty_level}")
+        .add_text("Job Description", request.job_description, settings.prompt_description_tokens)
+    )
+
+def question_messages(request: QuestionRequest) -> List[dict]:
+    """Chat messages for a question generation request"""
+    return question_prompt(request).messages()
+
+def topup_messages(request: QuestionRequest, existing: List[dict], missing: int) -> List[dict]:
+    """Chat messages asking only for the questions still missing"""
+    prompt = question_prompt(request.model_copy(update={"num_questions": missing}))
+    if existing:
+        asked = "\n".join(f"- {question['question']}" for question in existing)
+        prompt.add(f"Do not repeat any of these questions:\n{asked}")
+    return prompt.messages()
+
+async def generate_question_list(request: QuestionRequest) -> List[dict]:
+    """Questions for a request, from the question cache or a fresh completion.
+
+    Only complete, valid lists are cached; short lists and fallback
+    questions are not, so the next request tries the model again.
+    """
+    llm = get_provider_router()
+    # Check if any provider is configured before attempting API calls
+    if not llm.providers:
+        print("No LLM provider configured, using fallback questions")
+        return fallback_questions(request)
+    
+    cache_key = question_cache_key(request, llm.model)
+    if request.bypass_cache:
+        question_cache.bypassed += 1
+    else:
+        cached = await question_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        banked = await _from_bank(request)
+        if banked is not None:
+            return banked
+    
+    # Identical requests already in flight share that completion
+    return await question_flight.do(cache_key, lambda: _complete_questions(request, llm, cache_key))
+
+async def _complete_questions(request: QuestionRequest, llm, cache_key: str) -> List[dict]:
+    messages = question_messages(request)
+    
+    try:
+        content = await llm.complete(messages, max_tokens=1000, temperature=0.7)
+    except ProvidersUnavailable as e:
+        print(f"LLM providers unavailable: {e}")
+        # Final fallback: return generic questions
+        return fallback_questions(request)
+    
+    questions = question_validator.salvage(content, [], request.num_questions)
+    questions += await _top_up(request, llm, questions)
+    if not questions:
+        # Nothing usable in the output, even after the top-up
+        return fallback_questions(request)
+    if len(questions) == request.num_questions:
+        await question_cache.set(cache_key, questions)
+        await _add_to_bank(request, questions)
+    return questions
+
+async def _top_up(request: QuestionRequest, llm, questions: List[dict]) -> List[dict]:
+    """Valid questions from completions that ask only for the missing count"""
+    extra = []
+    for _ in range(settings.question_topup_attempts):
+        missing = request.num_questions - len(questions) - len(extra)
+        if missing <= 0:
+            break
+        question_validator.topups += 1
+        try:
+            content = await llm.complete(topup_messages(request, questions + extra, missing),
+                                         max_tokens=missing * TOKENS_PER_QUESTION, temperature=0.7)
+        except ProvidersUnavailable as e:
+            print(f"LLM providers unavailable for top-up: {e}")
+            break
+        added = question_validator.salvage(content, questions + extra, missing)
+        question_validator.topup_questions += len(added)
+        extra += added
+    return extra
+
+async def _from_bank(request: QuestionRequest):
+    """Stored questions of a similar earlier request, when the question bank is enabled"""
+    if not settings.question_bank_enabled:
+        return None
+    return await question_bank.lookup(request)
+
+async def _add_to_bank(request: QuestionRequest, questions: List[dict]) -> None:
+    if not settings.question_bank_enabled:
+        return
+    try:
+        await question_bank.add(request, questions)
+    except Exception as e:
+        # The bank is an optimization; never fail a generation because of it
+        print(f"Question bank update failed: {e}")
 
-@router.post("/questions", response_model=QuestionResponse)
+@router.post("/questions", response_model=QuestionResponse, dependencies=[Depends(admit_ai_request(get_current_user))])
 async def generate_questions(
     request: QuestionRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate AI-powered interview questions"""
     try:
-        # Create prompt for question generation
-        prompt = f"""
-        Generate {request.num_questions} interview questions for a {request.job_title} position.
-        
-        Job Description: {request.job_description or 'Not provided'}
-        Interview Type: {request.interview_type}
-        Difficulty Level: {request.difficulty_level}
-        
-        Please generate questions that are:
-        1. Relevant to the job title and description
-        2. Appropriate for the interview type (technical, behavioral, experience-based)
-        3. Matched to the difficulty level ({request.difficulty_level})
-        4. Professional and clear
-        
-        Return the questions as a JSON array with the following format:
-        [
-            {{
-                "question": "Question text here",
-                "type": "technical/behavioral/experience",
-                "difficulty": "easy/medium/hard",
-                "expected_answer_length": "short/medium/long"
-            }}
-        ]
-        """
-        
-        # Check if API keys are valid before attempting API calls
-        if not settings.openai_api_key or settings.openai_api_key == "":
-            print("No OpenAI API key provided, using fallback questions")
-            questions = [
-                {"text": f"What is your experience with {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                {"text": f"Describe a challenging project you worked on related to {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level},
-                {"text": f"How do you stay updated with the latest trends in {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                {"text": f"What tools and technologies do you use for {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                {"text": f"Tell me about a time you had to learn a new technology for {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level}
-            ]
-            return QuestionResponse(questions=questions)
-        
-        # Call OpenAI API (with fallback for testing)
-        try:
-            client = openai.OpenAI(api_key=settings.openai_api_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR professional and technical interviewer. Generate high-quality interview questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-        except Exception as e:
-            # Try Groq as fallback when OpenAI fails
-            print(f"OpenAI API error: {e}")
-            try:
-                from groq import Groq
-                groq_client = Groq(api_key="gsk_your_groq_api_key_here")  # You'll need to set this
-                response = groq_client.chat.completions.create(
-                    model="llama3-8b-8192",
-                    messages=[
-                        {"role": "system", "content": "You are an expert HR professional and technical interviewer. Generate high-quality interview questions."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.7
-                )
-                print("Successfully used Groq as fallback")
-            except Exception as groq_error:
-                print(f"Groq API error: {groq_error}")
-                # Final fallback: return mock questions
-                questions = [
-                    {"text": f"What is your experience with {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                    {"text": f"Describe a challenging project you worked on related to {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level},
-                    {"text": f"How do you stay updated with the latest trends in {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                    {"text": f"What tools and technologies do you use for {request.job_title}?", "type": request.interview_type, "difficulty": request.difficulty_level},
-                    {"text": f"Tell me about a time you had to learn a new technology for {request.job_title}", "type": request.interview_type, "difficulty": request.difficulty_level}
-                ]
-                return QuestionResponse(questions=questions)
-        
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        
-        # Try to extract JSON from the response
-        try:
-            # Find JSON array in the response
-            start_idx = content.find('[')
-            end_idx = content.rfind(']') + 1
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx]
-                questions = json.loads(json_str)
-            else:
-                # Fallback: create questions from the text
-                questions = [{"text": content, "type": request.interview_type, "difficulty": request.difficulty_level}]
-        except json.JSONDecodeError:
-            # Fallback: create a single question from the response
-            questions = [{"text": content, "type": request.interview_type, "difficulty": request.difficulty_level}]
-        
+        questions = await generate_question_list(request)
         return QuestionResponse(questions=questions)
         
     except Exception as e:
@@ -123,7 +175,103 @@ async def generate_questions(
             detail=f"Failed to generate questions: {str(e)}"
         )
 
-@router.post("/questions/custom")
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _question_events(request: QuestionRequest):
+    """question events as each array element completes, then a done event"""
+    llm = get_provider_router()
+    if not llm.providers:
+        for question in fallback_questions(request):
+            yield _sse("question", question)
+        yield _sse("done", {"count": 5, "source": "fallback"})
+        return
+    
+    cache_key = question_cache_key(request, llm.model)
+    if request.bypass_cache:
+        question_cache.bypassed += 1
+    else:
+        cached = await question_cache.get(cache_key)
+        if cached is not None:
+            for question in cached:
+                yield _sse("question", question)
+            yield _sse("done", {"count": len(cached), "source": "cache"})
+            return
+        banked = await _from_bank(request)
+        if banked is not None:
+            for question in banked:
+                yield _sse("question", question)
+            yield _sse("done", {"count": len(banked), "source": "bank"})
+            return
+    
+    parser = JSONArrayStream()
+    questions = []
+    question_validator.completions += 1
+    try:
+        async for delta in llm.stream(question_messages(request), max_tokens=1000, temperature=0.7):
+            for item in parser.feed(delta):
+                question = question_validator.validate(item, questions)
+                if question is not None and len(questions) < request.num_questions:
+                    questions.append(question)
+                    yield _sse("question", question)
+    except Exception as e:
+        print(f"LLM streaming error: {e}")
+        if questions:
+            yield _sse("error", {"detail": f"Stream interrupted after {len(questions)} questions"})
+    
+    if len(questions) < request.num_questions:
+        # Invalid, truncated or interrupted output: ask only for the missing questions
+        question_validator.partial += 1
+        for question in await _top_up(request, llm, questions):
+            questions.append(question)
+            yield _sse("question", question)
+    if not questions:
+        for question in fallback_questions(request):
+            yield _sse("question", question)
+        yield _sse("done", {"count": 5, "source": "fallback"})
+        return
+    if len(questions) == request.num_questions:
+        await question_cache.set(cache_key, questions)
+        await _add_to_bank(request, questions)
+    yield _sse("done", {"count": len(questions), "source": "llm"})
+
+@router.post("/questions/stream", dependencies=[Depends(admit_ai_request(get_current_user))])
+async def stream_questions(
+    request: QuestionRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Generate interview questions as Server-Sent Events.
+
+    Each question is sent as a `question` event as soon as its JSON object is
+    complete in the model output, followed by a `done` event.
+    """
+    return StreamingResponse(
+        _question_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+CUSTOM_QUESTION_SYSTEM_PROMPT = """You are a senior HR professional with expertise in technical and behavioral interviewing.
+
+As an expert interviewer, create interview questions for the position described by the user.
+
+Requirements:
+1. Questions should be specific to the job title
+2. Match the requested interview style
+3. Be appropriate for the requested difficulty level
+4. Include a mix of open-ended and specific questions
+5. Consider both technical skills and soft skills
+
+Format each question with:
+- The question text
+- Question type (technical/behavioral/experience)
+- Difficulty level
+- Expected answer length
+- Key points to evaluate
+
+Return as a structured JSON array."""
+
+@router.post("/questions/custom", dependencies=[Depends(admit_ai_request(get_current_user))])
 async def generate_custom_questions(
     job_title: str,
     job_description: str,
@@ -131,49 +279,20 @@ async def generate_custom_questions(
     difficulty_level: str = "medium",
     num_questions: int = 5,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate custom questions with more control"""
     try:
-        # Create a more detailed prompt
-        prompt = f"""
-        As an expert interviewer, create {num_questions} interview questions for a {job_title} position.
-        
-        Job Details:
-        - Title: {job_title}
-        - Description: {job_description}
-        - Interview Type: {interview_type}
-        - Difficulty: {difficulty_level}
-        
-        Requirements:
-        1. Questions should be specific to {job_title}
-        2. Match the {interview_type} interview style
-        3. Be appropriate for {difficulty_level} level
-        4. Include a mix of open-ended and specific questions
-        5. Consider both technical skills and soft skills
-        
-        Format each question with:
-        - The question text
-        - Question type (technical/behavioral/experience)
-        - Difficulty level
-        - Expected answer length
-        - Key points to evaluate
-        
-        Return as a structured JSON array.
-        """
-        
-        client = openai.OpenAI(api_key=settings.openai_api_key)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a senior HR professional with expertise in technical and behavioral interviewing."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1500,
-            temperature=0.6
+        messages = (
+            PromptBuilder(CUSTOM_QUESTION_SYSTEM_PROMPT)
+            .add(f"Create {num_questions} interview questions for a {job_title} position.\n"
+                 f"Interview Type: {interview_type}\n"
+                 f"Difficulty: {difficulty_level}")
+            .add_text("Job Description", job_description, settings.prompt_description_tokens)
+            .messages()
         )
         
-        content = response.choices[0].message.content.strip()
+        content = await get_provider_router().complete(messages, max_tokens=1500, temperature=0.6)
         
         # Parse JSON response
         try:
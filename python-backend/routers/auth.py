@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import User
 from schemas import User as UserSchema, Token
 from auth import create_access_token, get_or_create_user, get_current_user
@@ -12,7 +12,7 @@ import json
 router = APIRouter()
 
 @router.post("/google", response_model=Token)
-async def google_auth(request: dict, db: Session = Depends(get_db)):
+async def google_auth(request: dict, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user with Google OAuth token"""
     try:
         token = request.get("token")
@@ -45,7 +45,7 @@ async def google_auth(request: dict, db: Session = Depends(get_db)):
                 )
             
             # Get or create user
-            user = get_or_create_user(email, name, picture, "google", db)
+            user = await get_or_create_user(email, name, picture, "google", db)
             
             # Create access token
             access_token = create_access_token(data={"sub": user.email})
@@ -74,7 +74,7 @@ async def github_oauth_redirect():
     return {"message": "Redirect to GitHub OAuth2 consent screen"}
 
 @router.post("/github", response_model=Token)
-async def github_auth(request: dict, db: Session = Depends(get_db)):
+async def github_auth(request: dict, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user with GitHub OAuth"""
     try:
         code = request.get("code")
@@ -147,7 +147,7 @@ async def github_auth(request: dict, db: Session = Depends(get_db)):
                 )
             
             # Get or create user
-            user = get_or_create_user(email, name, picture, "github", db)
+            user = await get_or_create_user(email, name, picture, "github", db)
             
             # Create access token
             jwt_token = create_access_token(data={"sub": user.email})
@@ -1,49 +1,196 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import Interview, User
-from schemas import Interview as InterviewSchema, InterviewCreate, InterviewUpdate
-from auth import get_current_user, get_current_user_from_cookie
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
+from datetime import datetime
+from database import AsyncSessionLocal, get_async_db
+from models import Interview, User, parse_json_value
+from schemas import Interview as InterviewSchema, InterviewCreate, InterviewUpdate, InterviewSummary
+from auth import get_current_admin, get_interview_owner
+from cache import interview_cache, interview_cache_key
+from config import settings
+from etag import CACHE_CONTROL, etag_matches, list_etag, not_modified, row_etag
+from export import stream_interviews
+from jobs import FAILED, IN_PROGRESS, PENDING, READY, question_jobs
+from live_scoring import LiveSession, live_scoring, message_turns
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SUMMARY_COLUMNS, VERSION_COLUMNS, apply_filters, paginate
+from rate_limit import admit_ai_request_by_client
+from scoring import build_feedback, is_current, transcript_hash
+from transcripts import iter_ndjson, load_payload, save_transcript
+from warm_pool import warm_pool
 import uuid
 import json
 
 router = APIRouter()
 
-@router.get("/my", response_model=List[InterviewSchema])
+def _listing_query(fields: str):
+    """Full ORM rows, or a column-only query for the summary view"""
+    if fields == "summary":
+        return select(*SUMMARY_COLUMNS)
+    return select(Interview)
+
+def _listing_items(rows, fields: str):
+    if fields == "summary":
+        return [InterviewSummary.model_validate(row) for row in rows]
+    return rows
+
+async def _load_by_ids(db: AsyncSession, fields: str, ids: List[int]):
+    """Fetch listing rows by primary key, in the order of ids"""
+    result = await db.execute(_listing_query(fields).where(Interview.id.in_(ids)))
+    rows = result.all() if fields == "summary" else result.scalars().all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[interview_id] for interview_id in ids if interview_id in by_id]
+
+async def _listing_page(db: AsyncSession, filters, fields: str, limit: int, cursor: Optional[str],
+                        if_none_match: Optional[str], response: Response):
+    """One listing page with its ETag.
+
+    Conditional requests first page through the row versions only, so a
+    matching If-None-Match is answered with 304 without reading any payload.
+    """
+    if if_none_match:
+        versions, next_cursor = await paginate(db, filters(select(*VERSION_COLUMNS)), limit, cursor)
+        etag = list_etag(versions, fields, next_cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        rows = await _load_by_ids(db, fields, [row.id for row in versions])
+    else:
+        rows, next_cursor = await paginate(db, filters(_listing_query(fields)), limit, cursor)
+        etag = list_etag(rows, fields, next_cursor)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return _listing_items(rows, fields)
+
+@router.get("/my", response_model=Union[List[InterviewSummary], List[InterviewSchema]])
 async def get_my_interviews(
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    interview_type: Optional[str] = None,
+    created_by: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    job_title_prefix: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    fields: Literal["full", "summary"] = "full",
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all interviews for the current user"""
-    interviews = db.query(Interview).all()  # Get all interviews for now
-    return interviews
+    """Get one page of interviews for the current user, newest first.
+
+    The cursor for the following page is returned in the X-Next-Cursor header.
+    Pass fields=summary to skip the questions/feedback payloads.
+    """
+    def filters(stmt):
+        return apply_filters(
+            stmt.filter(Interview.user_id == current_user.id),
+            interview_type=interview_type,
+            created_by=created_by,
+            created_after=created_after,
+            created_before=created_before,
+            job_title_prefix=job_title_prefix,
+            recommendation=recommendation,
+            min_score=min_score,
+            max_score=max_score,
+        )
+
+    return await _listing_page(db, filters, fields, limit, cursor, if_none_match, response)
+
+@router.get("/export")
+async def export_interviews(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    interview_type: Optional[str] = None,
+    created_by: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    job_title_prefix: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    current_user: User = Depends(get_interview_owner)
+):
+    """Stream the current user's matching interviews with their parsed feedback as NDJSON or CSV"""
+    def filters(stmt):
+        return apply_filters(
+            stmt.where(Interview.user_id == current_user.id),
+            interview_type=interview_type,
+            created_by=created_by,
+            created_after=created_after,
+            created_before=created_before,
+            job_title_prefix=job_title_prefix,
+            recommendation=recommendation,
+            min_score=min_score,
+            max_score=max_score,
+        )
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_interviews(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="interviews.{format}"'}
+    )
 
 @router.get("/{interview_id}", response_model=InterviewSchema)
 async def get_interview(
     interview_id: int,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific interview by ID"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        # Interview.user_id == current_user.id  # Commented out due to database schema
-    ).first()
-    
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview not found"
-        )
+    """Get a specific interview by ID (served from the interview cache when possible)"""
+    cache_key = interview_cache_key(current_user.id, interview_id)
+    cached = await interview_cache.get(cache_key)
+    if cached is not None:
+        etag, _, payload = cached.partition(b"\n")
+        etag = etag.decode()
+    else:
+        if if_none_match:
+            # Check the row version before loading the questions/feedback columns
+            result = await db.execute(select(*VERSION_COLUMNS).where(
+                Interview.id == interview_id,
+                Interview.user_id == current_user.id
+            ))
+            version = result.first()
+            if version and etag_matches(if_none_match, row_etag(version)):
+                return not_modified(row_etag(version))
+        
+        result = await db.execute(select(Interview).where(
+            Interview.id == interview_id,
+            Interview.user_id == current_user.id
+        ))
+        interview = result.scalars().first()
+        
+        if not interview:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview not found"
+            )
+        
+        etag = row_etag(interview)
+        payload = InterviewSchema.model_validate(interview).model_dump_json().encode()
+        # Cached as "<etag>\n<json>" so hits can answer conditional requests too
+        await interview_cache.set(cache_key, etag.encode() + b"\n" + payload)
     
-    return interview
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
 
 @router.post("/", response_model=InterviewSchema)
 async def create_interview(
     interview_data: InterviewCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new interview"""
     # Generate unique interview link
@@ -55,28 +202,63 @@ async def create_interview(
         interview_type=interview_data.interview_type,
         duration=interview_data.duration,
         created_by=current_user.email,
-        user_name=interview_data.candidate_name,
-        questions=json.dumps(interview_data.questions) if interview_data.questions else None,
-        # user_id=current_user.id  # Commented out due to database schema
+        user_name=interview_data.user_name,
+        questions=parse_json_value(interview_data.questions) if interview_data.questions else None,
+        user_id=current_user.id
     )
     
     db.add(interview)
-    db.commit()
-    db.refresh(interview)
+    await db.commit()
+    await db.refresh(interview)
     
     return interview
 
+def _created_payload(interview: Interview, questions: List[dict]) -> dict:
+    """create-with-questions response in the format the frontend expects"""
+    return {
+        "interviewData": {
+            "id": interview.id,
+            "jobTitle": interview.job_title,
+            "description": interview.description,
+            "duration": interview.duration,
+            "interviewType": interview.interview_type,
+            "candidateName": interview.user_name,
+            "createdBy": interview.created_by,
+            "questionList": questions
+        },
+        # Convert questions to JSON string format that frontend expects
+        "questions": json.dumps({"question": questions})  # Frontend expects single JSON string
+    }
+
+def _job_status(interview: Interview) -> dict:
+    job = {
+        "jobId": interview.id,
+        "interviewId": interview.id,
+        "status": interview.status,
+        "statusUrl": f"/api/interviews/{interview.id}/status",
+        "eventsUrl": f"/api/interviews/{interview.id}/events",
+    }
+    if interview.status == READY:
+        questions = (parse_json_value(interview.questions) or {}).get("question", [])
+        job.update(_created_payload(interview, questions))
+    return job
+
 # Add endpoint to handle frontend interview creation with AI question generation
-@router.post("/create-with-questions")
+@router.post("/create-with-questions", dependencies=[Depends(admit_ai_request_by_client)])
 async def create_interview_with_questions(
     request: dict,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    async_mode: bool = Query(False, alias="async"),
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Create interview with AI-generated questions - frontend compatibility"""
+    """Create interview with AI-generated questions - frontend compatibility
+
+    With ?async=true the interview is stored as pending and questions are
+    generated in the background: the response is 202 with a job id to poll at
+    /{id}/status (or follow at /{id}/events).
+    """
     try:
-        import json
-        from routers.ai_questions import generate_questions
+        from routers.ai_questions import generate_question_list
         from schemas import QuestionRequest
         
         # Extract data from frontend request
@@ -92,16 +274,10 @@ async def create_interview_with_questions(
             job_description=description,
             interview_type=interview_type,
             difficulty_level="medium",
-            num_questions=5
+            num_questions=5,
+            bypass_cache=bool(request.get("bypassCache", False))
         )
         
-        # Call AI question generation
-        from routers.ai_questions import router as ai_questions_router
-        questions_response = await ai_questions_router.routes[0].endpoint(
-            question_request, current_user, db
-        )
-        
-        # Create interview
         interview = Interview(
             job_title=job_title,
             description=description,
@@ -109,50 +285,123 @@ async def create_interview_with_questions(
             duration=duration,
             created_by=current_user.email,
             user_name=candidate_name,
-            questions=json.dumps({"question": questions_response.questions}),
-            # user_id=current_user.id  # Commented out due to database schema
+            user_id=current_user.id
         )
         
+        # A pre-generated set for a popular role skips generation entirely
+        warm_questions = None
+        if settings.warm_pool_enabled and not question_request.bypass_cache:
+            warm_questions = warm_pool.take(question_request)
+        
+        if async_mode and warm_questions is None:
+            interview.status = PENDING
+            db.add(interview)
+            await db.commit()
+            await db.refresh(interview)
+            if not question_jobs.submit(interview.id, current_user.id, question_request):
+                await db.delete(interview)
+                await db.commit()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Question generation queue is full, try again shortly",
+                    headers={"Retry-After": "5"}
+                )
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=_job_status(interview))
+        
+        # Call AI question generation (served from the question cache when possible)
+        questions = warm_questions or await generate_question_list(question_request)
+        
+        # Create interview
+        interview.questions = {"question": questions}
         db.add(interview)
-        db.commit()
-        db.refresh(interview)
+        await db.commit()
+        await db.refresh(interview)
         
-        # Return in format expected by frontend
-        # Convert questions to JSON string format that frontend expects
-        questions_json = json.dumps({"question": questions_response.questions})
+        if async_mode:
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=_job_status(interview))
         
-        return {
-            "interviewData": {
-                "id": interview.id,
-                "jobTitle": interview.job_title,
-                "description": interview.description,
-                "duration": interview.duration,
-                "interviewType": interview.interview_type,
-                "candidateName": interview.user_name,
-                "createdBy": interview.created_by,
-                "questionList": questions_response.questions
-            },
-            "questions": questions_json  # Frontend expects single JSON string
-        }
+        # Return in format expected by frontend
+        return _created_payload(interview, questions)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create interview with questions: {str(e)}"
         )
 
+@router.get("/{interview_id}/status")
+async def get_interview_job_status(
+    interview_id: int,
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Question generation status of an interview created with ?async=true"""
+    result = await db.execute(select(Interview).where(
+        Interview.id == interview_id,
+        Interview.user_id == current_user.id
+    ))
+    interview = result.scalars().first()
+    
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    return _job_status(interview)
+
+@router.get("/{interview_id}/events")
+async def stream_interview_job_status(
+    interview_id: int,
+    current_user: User = Depends(get_interview_owner)
+):
+    """Server-Sent Events: one `status` event once question generation has finished"""
+    async def load():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Interview).where(
+                Interview.id == interview_id,
+                Interview.user_id == current_user.id
+            ))
+            return result.scalars().first()
+    
+    if await load() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    async def events():
+        while True:
+            interview = await load()
+            if interview is None or interview.status not in IN_PROGRESS:
+                break
+            yield ": pending\n\n"
+            # Woken early when the job runs in this process; otherwise re-check the row
+            await question_jobs.wait(interview_id, timeout=2.0)
+        payload = _job_status(interview) if interview else {"jobId": interview_id, "status": FAILED}
+        yield f"event: status\ndata: {json.dumps(payload, default=str)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.put("/{interview_id}", response_model=InterviewSchema)
 async def update_interview(
     interview_id: int,
     interview_update: InterviewUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing interview"""
-    interview = db.query(Interview).filter(
+    result = await db.execute(select(Interview).where(
         Interview.id == interview_id,
-        # Interview.user_id == current_user.id  # Commented out due to database schema
-    ).first()
+        Interview.user_id == current_user.id
+    ))
+    interview = result.scalars().first()
     
     if not interview:
         raise HTTPException(
@@ -163,24 +412,28 @@ async def update_interview(
     # Update only provided fields
     update_data = interview_update.dict(exclude_unset=True)
     for field, value in update_data.items():
+        if field in ("questions", "feedback"):
+            value = parse_json_value(value)
         setattr(interview, field, value)
     
-    db.commit()
-    db.refresh(interview)
+    await db.commit()
+    await interview_cache.delete(interview_cache_key(interview.user_id, interview.id))
+    await db.refresh(interview)
     
     return interview
 
 @router.delete("/{interview_id}")
 async def delete_interview(
     interview_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an interview"""
-    interview = db.query(Interview).filter(
+    result = await db.execute(select(Interview).where(
         Interview.id == interview_id,
-        # Interview.user_id == current_user.id  # Commented out due to database schema
-    ).first()
+        Interview.user_id == current_user.id
+    ))
+    interview = result.scalars().first()
     
     if not interview:
         raise HTTPException(
@@ -188,35 +441,67 @@ async def delete_interview(
             detail="Interview not found"
         )
     
-    db.delete(interview)
-    db.commit()
+    await db.delete(interview)
+    await db.commit()
+    await interview_cache.delete(interview_cache_key(interview.user_id, interview.id))
     
     return {"message": "Interview deleted successfully"}
 
-@router.get("/", response_model=List[InterviewSchema])
+@router.get("/", response_model=Union[List[InterviewSummary], List[InterviewSchema]])
 async def get_all_interviews(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    interview_type: Optional[str] = None,
+    created_by: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    job_title_prefix: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    fields: Literal["full", "summary"] = "full",
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all interviews (admin endpoint)"""
-    interviews = db.query(Interview).all()
-    return interviews
+    """Get one page of all users' interviews (admins listed in ADMIN_EMAILS), newest first"""
+    def filters(stmt):
+        return apply_filters(
+            stmt,
+            interview_type=interview_type,
+            created_by=created_by,
+            created_after=created_after,
+            created_before=created_before,
+            job_title_prefix=job_title_prefix,
+            recommendation=recommendation,
+            min_score=min_score,
+            max_score=max_score,
+        )
+
+    return await _listing_page(db, filters, fields, limit, cursor, if_none_match, response)
 
 # Add feedback endpoint for frontend compatibility
 @router.post("/{interview_id}/feedback")
 async def submit_interview_feedback(
     interview_id: int,
     request: dict,
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    refresh: bool = False,
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Submit interview feedback - frontend compatibility endpoint"""
+    """Submit interview feedback - frontend compatibility endpoint
+
+    Resubmitting the same conversation returns the stored feedback without
+    recomputing or writing it, unless ?refresh=true.
+    """
     try:
         # Get the interview
-        interview = db.query(Interview).filter(
+        result = await db.execute(select(Interview).where(
             Interview.id == interview_id,
-            # Interview.user_id == current_user.id  # Commented out due to database schema
-        ).first()
+            Interview.user_id == current_user.id
+        ))
+        interview = result.scalars().first()
         
         if not interview:
             raise HTTPException(
@@ -238,90 +523,25 @@ async def submit_interview_feedback(
             duration=request.get("duration", 15)
         )
         
-        # Generate feedback using the new fallback system
-        conversation_length = len(conversation)
-        conversation_text = ""
-        for conv in conversation:
-            if isinstance(conv, dict):
-                if 'role' in conv and 'content' in conv:
-                    role = "Interviewer" if conv['role'] == 'assistant' else "Candidate"
-                    conversation_text += f"{role}: {conv['content']}\n"
+        digest = transcript_hash(conversation)
+        feedback_data = parse_json_value(interview.feedback)
+        cached = not refresh and is_current(feedback_data, digest)
+        if not cached:
+            # Generate feedback using the shared keyword scorer
+            feedback_data = build_feedback(conversation, interview.job_title, interview.interview_type, digest)
         
-        conversation_text_lower = conversation_text.lower()
-        
-        # Analyze conversation content for scoring
-        technical_keywords = ['react', 'python', 'javascript', 'node', 'api', 'database', 'frontend', 'backend', 'coding', 'programming', 'development', 'framework', 'library', 'git', 'github']
-        communication_indicators = ['explain', 'describe', 'tell me', 'how', 'what', 'why', 'experience', 'project', 'team', 'work']
-        
-        # Count technical mentions
-        technical_mentions = sum(1 for keyword in technical_keywords if keyword in conversation_text_lower)
-        communication_quality = sum(1 for indicator in communication_indicators if indicator in conversation_text_lower)
-        
-        # Calculate dynamic scores
-        base_score = min(50 + (conversation_length * 3) + (technical_mentions * 2) + (communication_quality * 1), 90)
-        
-        # Generate detailed feedback based on actual conversation
-        feedback_analysis = f"Interview Analysis for {interview.job_title} Position:\n\n"
-        feedback_analysis += f"• Total conversation exchanges: {conversation_length}\n"
-        feedback_analysis += f"• Technical depth demonstrated: {'Good' if technical_mentions > 3 else 'Basic'}\n"
-        feedback_analysis += f"• Communication quality: {'Strong' if communication_quality > 5 else 'Adequate'}\n"
-        feedback_analysis += f"• Engagement level: {'High' if conversation_length > 5 else 'Moderate'}\n\n"
-        
-        # Generate strengths and areas for improvement based on actual conversation
-        strengths = []
-        areas_for_improvement = []
-        
-        if technical_mentions > 3:
-            strengths.append("Demonstrated good technical knowledge")
-        else:
-            areas_for_improvement.append("Could provide more technical examples")
-        
-        if communication_quality > 5:
-            strengths.append("Good communication skills")
-        else:
-            areas_for_improvement.append("Could improve communication clarity")
-        
-        if conversation_length > 5:
-            strengths.append("Engaged well in the interview")
-        else:
-            areas_for_improvement.append("Could provide more detailed responses")
-        
-        # Generate recommendation
-        recommendation = "Yes" if base_score > 65 else "No"
-        recommendation_msg = f"Based on the interview performance, the candidate is {'recommended' if base_score > 65 else 'not recommended'} for the next round. "
-        recommendation_msg += f"Overall engagement score: {base_score}/100"
-        
-        # Create comprehensive feedback
-        feedback_data = {
-            "ratings": {
-                "technicalSkills": max(4, min(9, (base_score + technical_mentions * 2) // 10)),
-                "communication": max(5, min(9, (base_score + communication_quality) // 10)),
-                "problemSolving": max(4, min(8, (base_score - 5) // 10)),
-                "experience": max(4, min(8, (base_score + technical_mentions) // 10))
-            },
-            "overallScore": base_score / 10,
-            "feedback": feedback_analysis,
-            "summary": [
-                f"Interview completed with {conversation_length} exchanges",
-                f"Technical knowledge: {'Strong' if technical_mentions > 3 else 'Basic'}",
-                f"Communication: {'Excellent' if communication_quality > 5 else 'Good'}",
-                f"Overall engagement: {base_score}/100"
-            ],
-            "strengths": strengths if strengths else ["Participated in interview", "Showed interest in position"],
-            "areas_for_improvement": areas_for_improvement if areas_for_improvement else ["Could provide more detailed examples"],
-            "recommendation": recommendation,
-            "recommendationMsg": recommendation_msg
-        }
-        
-        # Store feedback in database
-        interview.feedback = json.dumps(feedback_data)
-        db.commit()
+            # Store feedback in database, with the transcript for later re-scoring
+            interview.feedback = feedback_data
+            await save_transcript(db, interview.id, conversation)
+            await db.commit()
+            await interview_cache.delete(interview_cache_key(interview.user_id, interview.id))
         
         return {
             "feedback": feedback_data,
             "score": feedback_data["overallScore"],
             "strengths": feedback_data["strengths"],
-            "areas_for_improvement": feedback_data["areas_for_improvement"]
+            "areas_for_improvement": feedback_data["areas_for_improvement"],
+            "cached": cached
         }
         
     except Exception as e:
@@ -329,3 +549,78 @@ async def submit_interview_feedback(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to submit feedback: {str(e)}"
         )
+
+@router.websocket("/{interview_id}/live")
+async def live_interview_feedback(websocket: WebSocket, interview_id: int):
+    """Score conversation turns as they arrive during the call
+
+    Send {"turns": [...]} or single turn objects; every message is answered with
+    the running scores. {"type": "end"} stores and returns the final feedback.
+    The transcript is checkpointed periodically and when the connection drops.
+    """
+    # Short-lived session: a call can hold the socket open for many minutes
+    async with AsyncSessionLocal() as db:
+        try:
+            current_user = await get_interview_owner(websocket, db)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+            return
+        result = await db.execute(select(Interview).where(
+            Interview.id == interview_id,
+            Interview.user_id == current_user.id
+        ))
+        interview = result.scalars().first()
+    if not interview:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Interview not found")
+        return
+
+    session = await LiveSession.open(interview, live_scoring)
+    await websocket.accept()
+    live_scoring.sessions += 1
+    live_scoring.active += 1
+    try:
+        await websocket.send_json({"type": "ready", **session.running()})
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON"})
+                continue
+            if isinstance(message, dict) and message.get("type") == "end":
+                feedback = await session.finish()
+                await websocket.send_json({"type": "feedback", "feedback": feedback, "score": feedback["overallScore"]})
+                await websocket.close()
+                return
+            turns = message_turns(message)
+            if turns is None:
+                await websocket.send_json({"type": "error", "detail": "Expected a turn, {\"turns\": [...]} or {\"type\": \"end\"}"})
+                continue
+            session.add(turns)
+            if session.checkpoint_due():
+                await session.checkpoint()
+            await websocket.send_json({"type": "score", **session.running()})
+    except WebSocketDisconnect:
+        live_scoring.dropped += 1
+    finally:
+        live_scoring.active -= 1
+        if not session.finished:
+            await session.checkpoint()
+
+@router.get("/{interview_id}/transcript")
+async def get_interview_transcript(
+    interview_id: int,
+    current_user: User = Depends(get_interview_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stored conversation of an interview as NDJSON, one turn per line, decompressed as it is sent"""
+    result = await db.execute(select(Interview.id).where(
+        Interview.id == interview_id,
+        Interview.user_id == current_user.id
+    ))
+    stored = await load_payload(db, interview_id) if result.first() is not None else None
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcript not found"
+        )
+    return StreamingResponse(iter_ndjson(*stored), media_type="application/x-ndjson")
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
+import json
 
 # User schemas
 class UserBase(BaseModel):
@@ -31,6 +32,14 @@ class InterviewBase(BaseModel):
     questions: Optional[str] = None
     feedback: Optional[str] = None
     
+    # questions/feedback are JSON columns; the API keeps exposing them as JSON strings
+    @field_validator("questions", "feedback", mode="before")
+    @classmethod
+    def serialize_json_columns(cls, value):
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value)
+    
     class Config:
         from_attributes = True
 
@@ -50,12 +59,30 @@ class InterviewUpdate(BaseModel):
 class Interview(InterviewBase):
     id: int
     created_at: Optional[datetime] = None  # Made optional to handle existing records
-    # user_id: int  # Commented out due to database schema
+    updated_at: Optional[datetime] = None
+    status: Optional[str] = None
+    user_id: Optional[int] = None  # Optional until existing records are backfilled
 
     class Config:
         from_attributes = True
         populate_by_name = True
 
+class InterviewSummary(BaseModel):
+    """Lightweight listing view without the questions/feedback payloads"""
+    id: int
+    job_title: Optional[str] = None
+    interview_type: Optional[str] = None
+    duration: Optional[str] = None
+    user_name: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    status: Optional[str] = None
+    has_feedback: bool = False
+
+    class Config:
+        from_attributes = True
+
 # AI Question Generation schemas
 class QuestionRequest(BaseModel):
     job_title: str
@@ -63,6 +90,62 @@ class QuestionRequest(BaseModel):
     interview_type: str
     difficulty_level: str = "medium"
     num_questions: int = 5
+    bypass_cache: bool = False  # force a fresh generation (the result still refreshes the cache)
+
+# Variants models return for each label (after lowercasing and turning "-"/"_" into spaces)
+QUESTION_TYPE_ALIASES = {
+    "tech": "technical", "coding": "technical", "system design": "technical",
+    "behavioural": "behavioral", "behavior": "behavioral", "behaviour": "behavioral",
+    "situational": "behavioral", "culture fit": "behavioral", "cultural fit": "behavioral",
+    "experience based": "experience", "experiential": "experience", "background": "experience",
+    "problemsolving": "problem solving", "analytical": "problem solving",
+    "logical": "problem solving",
+    "leader": "leadership", "management": "leadership", "managerial": "leadership",
+}
+DIFFICULTY_ALIASES = {
+    "beginner": "easy", "basic": "easy", "simple": "easy", "entry level": "easy", "junior": "easy",
+    "intermediate": "medium", "moderate": "medium", "mid": "medium", "mid level": "medium",
+    "average": "medium", "normal": "medium",
+    "difficult": "hard", "advanced": "hard", "expert": "hard", "senior": "hard", "challenging": "hard",
+}
+ANSWER_LENGTH_ALIASES = {
+    "brief": "short", "concise": "short",
+    "moderate": "medium", "average": "medium",
+    "detailed": "long", "extended": "long", "in depth": "long",
+}
+
+def _canonical_label(value, aliases: Dict[str, str]):
+    if not isinstance(value, str):
+        return value
+    label = " ".join(value.lower().replace("-", " ").replace("_", " ").split())
+    return aliases.get(label, label)
+
+class GeneratedQuestion(BaseModel):
+    """One question object as the model is asked to return it"""
+    question: str = Field(min_length=10, max_length=1000)
+    type: Literal["technical", "behavioral", "experience", "problem solving", "leadership"]
+    difficulty: Literal["easy", "medium", "hard"]
+    expected_answer_length: Literal["short", "medium", "long"] = "medium"
+    
+    @field_validator("question", mode="before")
+    @classmethod
+    def collapse_whitespace(cls, value):
+        return " ".join(value.split()) if isinstance(value, str) else value
+    
+    @field_validator("type", mode="before")
+    @classmethod
+    def canonical_type(cls, value):
+        return _canonical_label(value, QUESTION_TYPE_ALIASES)
+    
+    @field_validator("difficulty", mode="before")
+    @classmethod
+    def canonical_difficulty(cls, value):
+        return _canonical_label(value, DIFFICULTY_ALIASES)
+    
+    @field_validator("expected_answer_length", mode="before")
+    @classmethod
+    def canonical_answer_length(cls, value):
+        return _canonical_label(value, ANSWER_LENGTH_ALIASES)
 
 class QuestionResponse(BaseModel):
     questions: List[Dict[str, Any]]
@@ -75,10 +158,11 @@ class FeedbackRequest(BaseModel):
     duration: int
 
 class FeedbackResponse(BaseModel):
-    feedback: str
-    score: int
+    feedback: Dict[str, Any]
+    score: float
     strengths: List[str]
     areas_for_improvement: List[str]
+    cached: bool = False  # stored feedback for the same conversation, not recomputed
 
 # OAuth schemas
 class Token(BaseModel):
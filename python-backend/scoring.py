@@ -0,0 +1,293 @@
+"""
+Heuristic transcript scoring for interview feedback
+
+Keyword lexicons (technical terms and communication indicators) are chosen per
+role and interview type. All terms of a lexicon are compiled into one regex (a
+character trie as a single alternation, bounded so that "how" does not match
+inside "show"), and each turn is scanned once, yielding its keyword counts per
+category. A term counts once towards the score however often it occurs. Turns
+can be added incrementally; only the new turns are scanned.
+
+Extra lexicons can be supplied as JSON through SCORING_LEXICONS_PATH, with the
+same shape as DEFAULT_LEXICONS; their terms are added to the defaults. Bump
+SCORING_VERSION whenever the scoring rules change. Stored feedback records the
+scoring version (rules plus a fingerprint of the lexicons) and a hash of the
+normalized transcript, so the same conversation is not scored twice.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config import settings
+
+SCORING_VERSION = "4"
+
+DEFAULT_LEXICONS: Dict[str, Any] = {
+    "default": {
+        "technical": ["react", "python", "javascript", "node", "api", "database", "frontend", "backend",
+                      "coding", "programming", "development", "framework", "library", "git", "github"],
+        "communication": ["explain", "describe", "tell me", "how", "what", "why", "experience", "project",
+                          "team", "work"],
+    },
+    # Added when the role word appears in the job title
+    "roles": {
+        "frontend": {"technical": ["css", "html", "typescript", "vue", "angular", "accessibility"]},
+        "backend": {"technical": ["sql", "rest", "microservices", "cache", "queue", "scalability"]},
+        "data": {"technical": ["sql", "pandas", "spark", "etl", "statistics", "machine learning"]},
+        "devops": {"technical": ["docker", "kubernetes", "terraform", "ci/cd", "monitoring", "aws"]},
+        "mobile": {"technical": ["ios", "android", "swift", "kotlin", "react native"]},
+    },
+    # Added for the interview type
+    "interview_types": {
+        "behavioral": {"communication": ["situation", "challenge", "conflict", "feedback", "learned", "result"]},
+    },
+}
+
+CATEGORIES = ("technical", "communication")
+
+
+def load_lexicons(path: Optional[str]) -> Dict[str, Any]:
+    """Default lexicons with the terms of the JSON file at path added"""
+    lexicons = json.loads(json.dumps(DEFAULT_LEXICONS))
+    if not path:
+        return lexicons
+    with open(path) as f:
+        extra = json.load(f)
+
+    def merge(target: Dict[str, List[str]], source: Dict[str, List[str]]) -> None:
+        for category, terms in source.items():
+            target.setdefault(category, [])
+            target[category] += [term for term in terms if term not in target[category]]
+
+    merge(lexicons["default"], extra.get("default", {}))
+    for section in ("roles", "interview_types"):
+        for name, source in extra.get(section, {}).items():
+            merge(lexicons[section].setdefault(name, {}), source)
+    return lexicons
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [(r"\s+" if ch == " " else re.escape(ch)) + build(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """All terms of a lexicon in one compiled, word-bounded regex"""
+
+    def __init__(self, lexicon: Dict[str, Sequence[str]]):
+        self.categories: Dict[str, str] = {}
+        for category, terms in lexicon.items():
+            for term in terms:
+                self.categories.setdefault(_normalize_term(term), category)
+        self.pattern = re.compile(r"(?<!\w)(?:" + _trie_pattern(self.categories) + r")(?!\w)")
+
+    def find(self, turn: str) -> List[str]:
+        """The terms in a turn, once per occurrence"""
+        terms = self.pattern.findall(turn.lower())
+        # Multi-word terms can match across any run of whitespace
+        return [term if term in self.categories else _normalize_term(term) for term in terms]
+
+
+def transcript_turns(conversation: Sequence[Any], start: int = 0) -> List[str]:
+    """One line of text per conversation item, in either frontend format; start numbers the first item"""
+    turns = []
+    for i, conv in enumerate(conversation, start):
+        if isinstance(conv, dict):
+            if 'role' in conv and 'content' in conv:
+                role = "Interviewer" if conv['role'] == 'assistant' else "Candidate"
+                turns.append(f"{role}: {conv['content']}")
+            else:
+                turns.append(f"Q{i+1}: {conv.get('question', '')}\nA{i+1}: {conv.get('answer', '')}")
+        else:
+            turns.append(f"Exchange {i+1}: {str(conv)}")
+    return turns
+
+
+class TranscriptScore:
+    """Keyword counts per turn plus the distinct terms seen per category; turns can be added incrementally"""
+
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.turn_counts: List[Dict[str, int]] = []
+        self.terms: Dict[str, Set[str]] = {category: set() for category in CATEGORIES}
+
+    def add_turns(self, turns: Sequence[str]) -> None:
+        categories = self.matcher.categories
+        for turn in turns:
+            found = self.matcher.find(turn)
+            for term in found:
+                self.terms.setdefault(categories[term], set()).add(term)
+            self.turn_counts.append(dict(Counter(categories[term] for term in found)))
+
+    @property
+    def turns(self) -> int:
+        return len(self.turn_counts)
+
+    @property
+    def technical_mentions(self) -> int:
+        return len(self.terms["technical"])
+
+    @property
+    def communication_quality(self) -> int:
+        return len(self.terms["communication"])
+
+    @property
+    def base_score(self) -> int:
+        return min(50 + (self.turns * 3) + (self.technical_mentions * 2) + (self.communication_quality * 1), 90)
+
+    def ratings(self) -> dict:
+        base_score = self.base_score
+        return {
+            "technicalSkills": max(4, min(9, (base_score + self.technical_mentions * 2) // 10)),
+            "communication": max(5, min(9, (base_score + self.communication_quality) // 10)),
+            "problemSolving": max(4, min(8, (base_score - 5) // 10)),
+            "experience": max(4, min(8, (base_score + self.technical_mentions) // 10))
+        }
+
+    def running(self) -> dict:
+        """Current scores, cheap enough to send after every turn"""
+        return {
+            "turns": self.turns,
+            "lastTurnCounts": self.turn_counts[-1] if self.turn_counts else {},
+            "technicalMentions": self.technical_mentions,
+            "communicationQuality": self.communication_quality,
+            "ratings": self.ratings(),
+            "overallScore": self.base_score / 10,
+        }
+
+    def feedback(self, job_title: Optional[str]) -> dict:
+        """Feedback document in the format stored on interviews"""
+        conversation_length = self.turns
+        technical_mentions = self.technical_mentions
+        communication_quality = self.communication_quality
+        base_score = self.base_score
+
+        # Generate detailed feedback based on actual conversation
+        feedback_analysis = f"Interview Analysis for {job_title} Position:\n\n"
+        feedback_analysis += f"• Total conversation exchanges: {conversation_length}\n"
+        feedback_analysis += f"• Technical depth demonstrated: {'Good' if technical_mentions > 3 else 'Basic'}\n"
+        feedback_analysis += f"• Communication quality: {'Strong' if communication_quality > 5 else 'Adequate'}\n"
+        feedback_analysis += f"• Engagement level: {'High' if conversation_length > 5 else 'Moderate'}\n\n"
+
+        # Generate strengths and areas for improvement based on actual conversation
+        strengths = []
+        areas_for_improvement = []
+
+        if technical_mentions > 3:
+            strengths.append("Demonstrated good technical knowledge")
+        else:
+            areas_for_improvement.append("Could provide more technical examples")
+
+        if communication_quality > 5:
+            strengths.append("Good communication skills")
+        else:
+            areas_for_improvement.append("Could improve communication clarity")
+
+        if conversation_length > 5:
+            strengths.append("Engaged well in the interview")
+        else:
+            areas_for_improvement.append("Could provide more detailed responses")
+
+        # Generate recommendation
+        recommendation = "Yes" if base_score > 65 else "No"
+        recommendation_msg = f"Based on the interview performance, the candidate is {'recommended' if base_score > 65 else 'not recommended'} for the next round. "
+        recommendation_msg += f"Overall engagement score: {base_score}/100"
+
+        return {
+            "ratings": self.ratings(),
+            "overallScore": base_score / 10,
+            "feedback": feedback_analysis,
+            "summary": [
+                f"Interview completed with {conversation_length} exchanges",
+                f"Technical knowledge: {'Strong' if technical_mentions > 3 else 'Basic'}",
+                f"Communication: {'Excellent' if communication_quality > 5 else 'Good'}",
+                f"Overall engagement: {base_score}/100"
+            ],
+            "strengths": strengths if strengths else ["Participated in interview", "Showed interest in position"],
+            "areas_for_improvement": areas_for_improvement if areas_for_improvement else ["Could provide more detailed examples"],
+            "recommendation": recommendation,
+            "recommendationMsg": recommendation_msg
+        }
+
+
+class FeedbackScorer:
+    def __init__(self, lexicons: Dict[str, Any]):
+        self.lexicons = lexicons
+        self._matcher = lru_cache(maxsize=64)(self._build_matcher)
+        # Changes with the rules and with the configured lexicons
+        fingerprint = hashlib.sha256(json.dumps(lexicons, sort_keys=True).encode()).hexdigest()[:12]
+        self.version = f"{SCORING_VERSION}:{fingerprint}"
+
+    def _build_matcher(self, roles: Tuple[str, ...], interview_type: str) -> KeywordMatcher:
+        lexicon = {category: list(terms) for category, terms in self.lexicons["default"].items()}
+        extras = [self.lexicons["roles"][role] for role in roles]
+        extras.append(self.lexicons["interview_types"].get(interview_type, {}))
+        for extra in extras:
+            for category, terms in extra.items():
+                lexicon.setdefault(category, []).extend(terms)
+        return KeywordMatcher(lexicon)
+
+    def matcher(self, job_title: Optional[str], interview_type: Optional[str]) -> KeywordMatcher:
+        title_words = set(re.findall(r"\w+", (job_title or "").lower()))
+        roles = tuple(sorted(role for role in self.lexicons["roles"] if role in title_words))
+        return self._matcher(roles, (interview_type or "").strip().lower())
+
+    def start(self, job_title: Optional[str], interview_type: Optional[str]) -> TranscriptScore:
+        return TranscriptScore(self.matcher(job_title, interview_type))
+
+    def score(self, conversation: Sequence[Any], job_title: Optional[str],
+              interview_type: Optional[str]) -> TranscriptScore:
+        score = self.start(job_title, interview_type)
+        score.add_turns(transcript_turns(conversation))
+        return score
+
+
+feedback_scorer = FeedbackScorer(load_lexicons(settings.scoring_lexicons_path))
+
+
+def transcript_hash(conversation: Sequence[Any]) -> str:
+    """sha256 of the conversation's turns with whitespace normalized"""
+    turns = [" ".join(turn.split()) for turn in transcript_turns(conversation)]
+    return hashlib.sha256(json.dumps(turns).encode()).hexdigest()
+
+
+def is_current(feedback: Any, digest: str) -> bool:
+    """Whether stored feedback was computed from this transcript with the current scoring"""
+    return (isinstance(feedback, dict) and feedback.get("transcriptHash") == digest
+            and feedback.get("scoringVersion") == feedback_scorer.version)
+
+
+def build_feedback(conversation: Sequence[Any], job_title: Optional[str], interview_type: Optional[str],
+                   digest: Optional[str] = None) -> dict:
+    """Heuristic feedback for a conversation, stamped with its transcript hash and scoring version"""
+    feedback = feedback_scorer.score(conversation, job_title, interview_type).feedback(job_title)
+    return stamp_feedback(feedback, conversation, digest)
+
+
+def stamp_feedback(feedback: dict, conversation: Sequence[Any], digest: Optional[str] = None) -> dict:
+    """Record the transcript hash and scoring version a feedback document was computed from"""
+    feedback["transcriptHash"] = digest or transcript_hash(conversation)
+    feedback["scoringVersion"] = feedback_scorer.version
+    return feedback
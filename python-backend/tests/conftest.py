@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# Point the app at a throwaway SQLite database before any backend module is imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from database import Base, SessionLocal, engine
+from models import Interview, User
+from routers import ai_feedback
+
+app = FastAPI()
+app.include_router(ai_feedback.router, prefix="/api/ai")
+
+
+def test_get_interview_feedback_reads_the_score_from_the_stored_feedback():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        # The cookie auth mock answers as the first user
+        user = db.execute(select(User).limit(1)).scalars().first()
+        if user is None:
+            user = User(email="test@example.com", name="Test User")
+            db.add(user)
+            db.flush()
+        scored = Interview(job_title="Engineer", user_id=user.id, feedback={"overallScore": 7.5})
+        unscored = Interview(job_title="Engineer", user_id=user.id)
+        db.add_all([scored, unscored])
+        db.commit()
+        ids = scored.id, unscored.id
+
+    with TestClient(app) as client:
+        response = client.get(f"/api/ai/feedback/{ids[0]}")
+        assert response.status_code == 200
+        assert response.json()["score"] == 7.5
+        assert response.json()["feedback"]["overallScore"] == 7.5
+
+        response = client.get(f"/api/ai/feedback/{ids[1]}")
+        assert response.status_code == 200
+        assert response.json()["score"] is None
@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from database import Base
+from etag import row_etag
+from models import Interview
+from pagination import VERSION_COLUMNS
+
+
+def test_etag_changes_on_every_write_within_one_second(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'etag.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        interview = Interview(job_title="Engineer")
+        db.add(interview)
+        db.commit()
+        etags = [row_etag(db.execute(select(*VERSION_COLUMNS)).one())]
+
+        # SQLite timestamps have one-second resolution; all three writes land in the same second
+        interview.feedback = {"overallScore": 7.0}
+        db.commit()
+        etags.append(row_etag(db.execute(select(*VERSION_COLUMNS)).one()))
+
+        db.execute(update(Interview).where(Interview.id == interview.id).values(status="ready"))
+        db.commit()
+        etags.append(row_etag(db.execute(select(*VERSION_COLUMNS)).one()))
+
+        db.execute(update(Interview), [{"id": interview.id, "feedback": {"overallScore": 8.0}}])
+        db.commit()
+        etags.append(row_etag(db.execute(select(*VERSION_COLUMNS)).one()))
+
+    assert len(set(etags)) == len(etags)
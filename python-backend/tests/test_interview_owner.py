@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from auth import create_access_token
+from database import Base, SessionLocal, engine
+from models import User
+from routers import interviews
+
+app = FastAPI()
+app.include_router(interviews.router, prefix="/api/interviews")
+
+
+def test_owner_scoped_routes_resolve_the_same_identity():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        # The cookie auth mock answers as the first user; the bearer user must be someone else
+        if db.execute(select(User).limit(1)).scalars().first() is None:
+            db.add(User(email="test@example.com", name="Test User"))
+            db.flush()
+        db.add(User(email="owner@example.com", name="Owner"))
+        db.commit()
+    bearer = {"Authorization": "Bearer " + create_access_token({"sub": "owner@example.com"})}
+
+    with TestClient(app) as client:
+        created = client.post("/api/interviews/", json={"job_title": "Engineer", "interview_type": "Technical"},
+                              headers=bearer)
+        assert created.status_code == 200
+        interview_id = created.json()["id"]
+
+        mine = client.get("/api/interviews/my", params={"limit": 200}, headers=bearer).json()
+        assert interview_id in [item["id"] for item in mine]
+        assert client.get(f"/api/interviews/{interview_id}", headers=bearer).status_code == 200
+        assert client.put(f"/api/interviews/{interview_id}", json={"job_title": "Lead"}, headers=bearer).status_code == 200
+        # Cookie-only callers are the mock's first user, not the owner
+        assert client.get(f"/api/interviews/{interview_id}").status_code == 404
+        assert client.delete(f"/api/interviews/{interview_id}", headers=bearer).status_code == 200
@@ -0,0 +1,50 @@
+import asyncio
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database import Base
+from models import Interview
+from pagination import paginate
+
+
+async def _walk(tmp_path, limit):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pages.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # created_at comes from the server default, so most rows share one second
+        await conn.execute(insert(Interview), [{"job_title": f"Job {i}"} for i in range(7)])
+        for _ in range(2):
+            await conn.execute(insert(Interview).values(job_title="Undated", created_at=None))
+
+    seen, pages, cursor = [], 0, None
+    async with AsyncSession(engine) as db:
+        while True:
+            rows, cursor = await paginate(db, select(Interview), limit, cursor)
+            seen += [row.id for row in rows]
+            pages += 1
+            assert pages <= 10, "pagination did not terminate"
+            if cursor is None:
+                break
+    await engine.dispose()
+    return seen
+
+
+def test_keyset_pages_cover_every_row_once_on_sqlite(tmp_path):
+    for limit in (1, 3):
+        (tmp_path / str(limit)).mkdir()
+        seen = asyncio.run(_walk(tmp_path / str(limit), limit))
+        assert sorted(seen) == list(range(1, 10))
+        # Undated rows come last, paged by id
+        assert seen[-2:] == [9, 8]
+
+
+def test_cursor_is_a_row_value_comparison_on_postgresql():
+    from datetime import datetime, timezone
+
+    from sqlalchemy.dialects import postgresql, sqlite
+    from pagination import keyset_before
+
+    condition = keyset_before(datetime(2024, 1, 1, tzinfo=timezone.utc), 42)
+    assert str(condition.compile(dialect=postgresql.dialect())).startswith("(interview.created_at, interview.id) <")
+    assert str(condition.compile(dialect=sqlite.dialect())).startswith("(julianday(interview.created_at), interview.id) <")
@@ -0,0 +1,61 @@
+import asyncio
+
+from providers import CircuitBreaker, Provider, ProviderRouter, RollingStats
+
+
+class FakeClient:
+    model = "fake"
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    async def complete(self, messages, max_tokens=1000, temperature=0.7):
+        return await self.reply()
+
+    def stats(self) -> dict:
+        return {}
+
+
+def provider(name, reply):
+    return Provider(name, FakeClient(reply), CircuitBreaker(failure_threshold=1), RollingStats())
+
+
+def test_hedge_finishing_with_the_winner_does_not_trip_its_breaker():
+    async def run():
+        answered = asyncio.Event()
+
+        async def reply():
+            await answered.wait()
+            return "questions"
+
+        primary, hedge = provider("primary", reply), provider("hedge", reply)
+        router = ProviderRouter([primary, hedge], deadline=5.0, hedge_delay=0.01)
+        # Both attempts are waiting when the event fires, so they complete in the same wait() round
+        asyncio.get_running_loop().call_later(0.05, answered.set)
+        assert await router.complete([]) == "questions"
+        return primary, hedge
+
+    primary, hedge = asyncio.run(run())
+    assert primary.breaker.state == hedge.breaker.state == "closed"
+    assert primary.stats.error_rate == hedge.stats.error_rate == 0.0
+
+
+def test_hanging_primary_outrun_by_hedges_opens_its_breaker():
+    async def run():
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "questions"
+
+        primary, hedge = provider("primary", hang), provider("hedge", fast)
+        router = ProviderRouter([primary, hedge], deadline=5.0, hedge_delay=0.01)
+        for _ in range(3):
+            assert await router.complete([]) == "questions"
+        return router, primary
+
+    router, primary = asyncio.run(run())
+    assert primary.breaker.state == "open"
+    assert primary.stats.samples == 1
+    # Once the breaker is open the hedge provider is asked first, without waiting for a hedge delay
+    assert router.hedges == 1
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from auth import create_access_token
+from rate_limit import AdmissionController, client_key
+
+
+def request(host, authorization=None):
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "headers": headers, "client": (host, 5000)})
+
+
+def test_client_key_prefers_a_valid_bearer_identity_over_the_address():
+    token = create_access_token({"sub": "ada@example.com"})
+    assert client_key(request("10.0.0.1", f"Bearer {token}")) == "sub:ada@example.com"
+    assert client_key(request("10.0.0.1", "Bearer forged")) == "client:10.0.0.1"
+    assert client_key(request("10.0.0.2")) == "client:10.0.0.2"
+
+
+def test_each_client_has_its_own_bucket():
+    async def run():
+        admission = AdmissionController(user_rate=0, user_burst=1, global_rate=100, global_burst=100,
+                                        max_concurrency=4, max_queue=4, queue_timeout=1)
+        await admission.acquire("client:10.0.0.1")
+        admission.release()
+        with pytest.raises(HTTPException) as rejected:
+            await admission.acquire("client:10.0.0.1")
+        assert rejected.value.status_code == 429
+        await admission.acquire("client:10.0.0.2")
+        admission.release()
+
+    asyncio.run(run())
@@ -0,0 +1,12 @@
+from scoring import feedback_scorer
+
+
+def test_terms_match_whole_words_and_are_counted_per_turn():
+    score = feedback_scorer.start("Backend Engineer", "Technical")
+    score.add_turns(["Candidate: let me show you the REST api, then the api cache",
+                     "Interviewer: tell  me how"])
+
+    assert score.turn_counts == [{"technical": 4}, {"communication": 2}]
+    assert score.terms["technical"] == {"rest", "api", "cache"}
+    # "show" does not count as "how"; "tell  me" matches the multi-word term
+    assert score.terms["communication"] == {"tell me", "how"}
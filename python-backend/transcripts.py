@@ -0,0 +1,151 @@
+"""
+Stored interview transcripts
+
+The conversation submitted with an interview's feedback is kept in the
+interview_transcript table (one row per interview, replaced on resubmission),
+so feedback can be recomputed later without the client (see rescoring.py).
+Nothing on the Interview model references it, so interview reads never load it.
+
+Turns are stored as NDJSON (one turn per line) compressed with zstd when the
+optional `zstandard` package is installed and TRANSCRIPT_CODEC=zstd, otherwise
+with gzip. Each row records its codec, so rows written with either codec stay
+readable. The payload column is deferred and is decompressed a chunk at a
+time, so a transcript can be streamed without holding the decoded text.
+"""
+
+import gzip
+import json
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import InterviewTranscript
+
+CODECS = ("zstd", "gzip")
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 9
+# Compressed bytes fed to the decompressor per step when streaming
+READ_CHUNK_SIZE = 64 * 1024
+
+_zstd = None
+
+
+def _zstandard():
+    global _zstd
+    if _zstd is None:
+        try:
+            import zstandard
+
+            _zstd = zstandard
+        except ImportError:
+            _zstd = False
+    return _zstd
+
+
+def default_codec() -> str:
+    codec = settings.transcript_codec.strip().lower()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown transcript codec: {settings.transcript_codec}")
+    return "zstd" if codec == "zstd" and _zstandard() else "gzip"
+
+
+def encode_turns(turns: List[Any], codec: Optional[str] = None) -> Tuple[bytes, str, int]:
+    """(compressed payload, codec, uncompressed size) for a list of turns"""
+    codec = codec or default_codec()
+    raw = "".join(json.dumps(turn, separators=(",", ":")) + "\n" for turn in turns).encode()
+    if codec == "zstd":
+        payload = _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        payload = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    return payload, codec, len(raw)
+
+
+def _decompressor(codec: str):
+    if codec == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if codec == "zstd":
+        zstandard = _zstandard()
+        if not zstandard:
+            raise RuntimeError("Reading zstd transcripts requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unknown transcript codec: {codec}")
+
+
+def iter_ndjson(payload: bytes, codec: str) -> Iterator[bytes]:
+    """Decompressed NDJSON, one chunk of the payload at a time"""
+    decompressor = _decompressor(codec)
+    for start in range(0, len(payload), READ_CHUNK_SIZE):
+        data = decompressor.decompress(payload[start:start + READ_CHUNK_SIZE])
+        if data:
+            yield data
+    if codec == "gzip":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def iter_turns(payload: bytes, codec: str) -> Iterator[Any]:
+    pending = b""
+    for data in iter_ndjson(payload, codec):
+        *lines, pending = (pending + data).split(b"\n")
+        for line in lines:
+            if line:
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+class TranscriptStats:
+    def __init__(self):
+        self.saved = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def record(self, raw_size: int, stored_size: int) -> None:
+        self.saved += 1
+        self.raw_bytes += raw_size
+        self.stored_bytes += stored_size
+
+    def stats(self) -> dict:
+        return {
+            "codec": default_codec(),
+            "saved": self.saved,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else 0.0,
+        }
+
+
+transcript_stats = TranscriptStats()
+
+
+async def save_transcript(db: AsyncSession, interview_id: int, conversation: List[Any]) -> None:
+    """Insert or replace the transcript of an interview; committed with the caller's session"""
+    payload, codec, raw_size = encode_turns(conversation)
+    values = {"payload": payload, "codec": codec, "turn_count": len(conversation), "raw_size": raw_size}
+    result = await db.execute(select(InterviewTranscript).where(InterviewTranscript.interview_id == interview_id))
+    transcript = result.scalars().first()
+    if transcript is None:
+        db.add(InterviewTranscript(interview_id=interview_id, **values))
+    else:
+        for name, value in values.items():
+            setattr(transcript, name, value)
+    transcript_stats.record(raw_size, len(payload))
+
+
+async def load_payload(db: AsyncSession, interview_id: int) -> Optional[Tuple[bytes, str]]:
+    """(compressed payload, codec) of an interview's transcript, if it has one"""
+    result = await db.execute(
+        select(InterviewTranscript.payload, InterviewTranscript.codec)
+        .where(InterviewTranscript.interview_id == interview_id)
+    )
+    row = result.first()
+    return (row.payload, row.codec) if row is not None else None
+
+
+async def load_transcript(db: AsyncSession, interview_id: int) -> Optional[List[Any]]:
+    stored = await load_payload(db, interview_id)
+    return list(iter_turns(*stored)) if stored is not None else None
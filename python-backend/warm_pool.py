@@ -0,0 +1,178 @@
+"""
+Warm pool of pre-generated question sets for popular roles
+
+A background task looks up the most frequent (job title, interview type)
+combinations among recent interviews and keeps up to WARM_POOL_SIZE fresh,
+unused question sets for each, so create-with-questions can take one without
+waiting on the LLM. Sets are handed out once and expire after
+WARM_POOL_MAX_AGE seconds. With WARM_POOL_EVICTION=drop, the sets of a role
+that falls out of the top WARM_POOL_TOP_N are removed at the next refresh;
+with "expire" they stay until used or expired.
+
+The pool lives in each worker process and is off by default, because it spends
+tokens ahead of demand. Generic fallback questions (no provider available)
+and short lists are never pooled.
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from config import settings
+from database import AsyncSessionLocal
+from models import Interview
+from schemas import QuestionRequest
+
+# Difficulty used by create-with-questions (the interview table does not store one)
+DEFAULT_DIFFICULTY = "medium"
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def pool_key(request: QuestionRequest) -> Tuple[str, str, str]:
+    return (_normalize(request.job_title), _normalize(request.interview_type), _normalize(request.difficulty_level))
+
+
+class WarmPool:
+    def __init__(self, size: int, top_n: int, refresh_interval: float, max_age: float,
+                 lookback_days: int, eviction: str):
+        if eviction not in ("drop", "expire"):
+            raise ValueError(f"Unknown warm pool eviction policy: {eviction}")
+        self.size = size
+        self.top_n = top_n
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.lookback_days = lookback_days
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.evicted = 0
+        self.rejected = 0
+        self._sets: Dict[Tuple[str, str, str], Deque[Tuple[float, List[dict]]]] = {}
+        self._requests: Dict[Tuple[str, str, str], QuestionRequest] = {}
+        self._popular_at = 0.0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def take(self, request: QuestionRequest) -> Optional[List[dict]]:
+        """An unused, unexpired question set for this request, if one is ready"""
+        key = pool_key(request)
+        sets = self._sets.get(key)
+        now = time.monotonic()
+        while sets:
+            created_at, questions = sets.popleft()
+            if now - created_at <= self.max_age and len(questions) >= request.num_questions:
+                self.hits += 1
+                self._wake.set()  # refill this role in the background
+                return questions[:request.num_questions]
+            self.evicted += 1
+        self.misses += 1
+        return None
+
+    async def popular_requests(self) -> List[QuestionRequest]:
+        """Most frequent (job title, interview type) pairs over the lookback window"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
+        title = func.lower(func.trim(Interview.job_title))
+        kind = func.lower(func.trim(Interview.interview_type))
+        query = (
+            select(func.min(Interview.job_title), func.min(Interview.interview_type), func.count())
+            .where(Interview.created_at >= cutoff, Interview.job_title.isnot(None), Interview.job_title != "")
+            .group_by(title, kind)
+            .order_by(func.count().desc())
+            .limit(self.top_n)
+        )
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+        return [
+            QuestionRequest(job_title=job_title, interview_type=interview_type or "Technical",
+                            difficulty_level=DEFAULT_DIFFICULTY, num_questions=5)
+            for job_title, interview_type, _ in rows
+        ]
+
+    def _evict(self, popular: Dict[Tuple[str, str, str], QuestionRequest]) -> None:
+        now = time.monotonic()
+        for key in list(self._sets):
+            sets = self._sets[key]
+            fresh = deque(item for item in sets if now - item[0] <= self.max_age)
+            if self.eviction == "drop" and key not in popular:
+                fresh.clear()
+            self.evicted += len(sets) - len(fresh)
+            if fresh:
+                self._sets[key] = fresh
+            else:
+                del self._sets[key]
+
+    async def refresh(self) -> None:
+        """Re-rank roles when due, evict, and top every popular role up to the pool size"""
+        from routers.ai_questions import FallbackQuestions, generate_question_list
+
+        if not self._requests or time.monotonic() - self._popular_at >= self.refresh_interval:
+            self._requests = {pool_key(request): request for request in await self.popular_requests()}
+            self._popular_at = time.monotonic()
+        self._evict(self._requests)
+
+        for key, request in self._requests.items():
+            sets = self._sets.setdefault(key, deque())
+            while len(sets) < self.size:
+                # bypass_cache: every pooled set is a fresh generation, not a cached copy
+                questions = await generate_question_list(request.model_copy(update={"bypass_cache": True}))
+                if isinstance(questions, FallbackQuestions) or len(questions) < request.num_questions:
+                    # Providers are down or the output was short: retry this role at the next refresh
+                    self.rejected += 1
+                    break
+                sets.append((time.monotonic(), questions))
+                self.generated += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ Warm pool refresh failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "roles": len(self._requests),
+            "sets": sum(len(sets) for sets in self._sets.values()),
+            "size": self.size,
+            "eviction": self.eviction,
+            "generated": self.generated,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+warm_pool = WarmPool(
+    size=settings.warm_pool_size,
+    top_n=settings.warm_pool_top_n,
+    refresh_interval=settings.warm_pool_refresh_interval,
+    max_age=settings.warm_pool_max_age,
+    lookback_days=settings.warm_pool_lookback_days,
+    eviction=settings.warm_pool_eviction,
+)